@@ -78,6 +78,43 @@ def parse_time_to_seconds(time_str: str) -> Optional[float]:
         return None
 
 
+# Fast path for the common spellings: [HH:]MM:SS with optional decimals, or whole
+# seconds. Anything else float() might still accept goes through the scalar parser.
+_TIME_PATTERN = (
+    r'^(?:(?:(?P<h>\d+(?:\.\d+)?):)?(?P<m>\d+(?:\.\d+)?):(?P<s>\d+(?:\.\d+)?)'
+    r'|(?P<secs>\d+))$'
+)
+
+
+def parse_time_series_to_seconds(times: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_time_to_seconds for a whole column.
+    
+    Tokenizes every value with one regex pass (Series.str.extract) and
+    combines hours/minutes/seconds with numpy arithmetic instead of calling
+    the Python parser once per row. Values the regex does not match (signs,
+    inner spaces, underscores, exponents, ...) fall back to
+    parse_time_to_seconds, so both parsers agree on every input.
+    
+    Args:
+        times: Series of time strings
+    
+    Returns:
+        Float Series of seconds, NaN where the value is missing or invalid
+    """
+    parts = times.astype('string').str.strip().str.extract(_TIME_PATTERN).astype(float)
+    
+    hours = parts['h'].fillna(0).to_numpy()
+    seconds = hours * 3600 + parts['m'].to_numpy() * 60 + parts['s'].to_numpy()
+    seconds = np.where(parts['secs'].notna(), parts['secs'].to_numpy(), seconds)
+    
+    unmatched = (parts['m'].isna() & parts['secs'].isna() & times.notna()).to_numpy()
+    if unmatched.any():
+        seconds[unmatched] = times[unmatched].map(parse_time_to_seconds).astype(float).to_numpy()
+    
+    return pd.Series(seconds, index=times.index)
+
+
 def standardize_venue_name(venue: str) -> str:
     """Standardize venue names using mapping dictionary."""
     if pd.isna(venue):
@@ -182,7 +219,7 @@ def clean_data(input_file: Path, output_file: Path, test_mode: bool = False) ->
     
     for col in time_columns:
         if col in df.columns:
-            df[f'{col}_seconds'] = df[col].apply(parse_time_to_seconds)
+            df[f'{col}_seconds'] = parse_time_series_to_seconds(df[col])
     
     # 2. Standardize venue names
     print("2. Standardizing venue names...")
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Season 8 leaderboard scrapers.
+
+Time parsing, request rate limiting, leaderboard page fetching, the Chrome
+fallback driver, event-ID discovery (with the sidecar cache) and run-time
+division scraping (plus the pro_run_times table setup) used by
+scrape_pro_run_times.py, scrape_na_run_times.py and scrape_station_times.py. The rate limiter is also
+shared with scrape_hyrox_results.py and research/scrape_research_data.py.
+Keeping one copy means every fix or speed-up applies to all of them.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup
+
+BASE_URL = 'https://results.hyrox.com/season-8/'
+
+# Sidecar cache of discovered event IDs, keyed by event group
+EVENT_ID_CACHE = Path('data/event_ids_cache.json')
+_cache_lock = threading.Lock()
+
+# Shared HTTP session for leaderboard pages (keep-alive connections pooled)
+session = requests.Session()
+
+
+class RateLimiter:
+    """
+    Minimum-interval request gate.
+    
+    Blocks only when the next request would exceed the configured rate, so no
+    time is spent sleeping after the final page. Thread-safe.
+    """
+    
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Chrome content settings: skip images, stylesheets and fonts (only row HTML is needed)
+BLOCKED_CONTENT_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.stylesheets': 2,
+    'profile.managed_default_content_settings.fonts': 2,
+}
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.woff*', '*.css', '*google-analytics*',
+]
+
+
+def create_driver():
+    """Create a headless Chrome WebDriver that skips non-HTML assets."""
+    # Imported here so HTTP-only scrapers can use this module without selenium
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_experimental_option('prefs', BLOCKED_CONTENT_PREFS)
+    
+    driver = webdriver.Chrome(options=options)
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    return driver
+
+
+class LazyDriver:
+    """
+    Chrome WebDriver started on first use and reused for the rest of the run.
+    
+    Pages are normally fetched over HTTP, so the browser is only needed for
+    the render fallback. A run where that fallback never fires never starts
+    Chrome at all.
+    """
+    
+    def __init__(self):
+        self._driver = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        with self._lock:
+            if self._driver is None:
+                self._driver = create_driver()
+        return getattr(self._driver, name)
+    
+    def quit(self):
+        if self._driver is not None:
+            self._driver.quit()
+
+
+# [H:]MM:SS with an optional leading "Run Total"/"Total" column label
+_TIME_PATTERN = re.compile(r'^\s*(?:Run Total|Total)?\s*(?:(\d+):)?(\d+):(\d+)\s*$')
+
+
+def parse_time_to_seconds(time_str):
+    """Convert HH:MM:SS or MM:SS to seconds."""
+    return parse_times_to_seconds([time_str])[0]
+
+
+def parse_times_to_seconds(time_strs):
+    """Convert a batch of time strings to seconds (None where unparseable)."""
+    match = _TIME_PATTERN.match
+    seconds = []
+    for time_str in time_strs:
+        m = match(time_str) if time_str else None
+        if m:
+            hours, minutes, secs = m.groups()
+            seconds.append(int(hours or 0) * 3600 + int(minutes) * 60 + int(secs))
+        else:
+            seconds.append(None)
+    return seconds
+
+
+def load_cache():
+    """Load the event-ID sidecar cache ({event_group: {kind: event_id}})."""
+    if not EVENT_ID_CACHE.exists():
+        return {}
+    with open(EVENT_ID_CACHE, 'r') as f:
+        return json.load(f)
+
+
+def save_cache(cache):
+    """Persist the event-ID cache atomically (write temp file, then rename)."""
+    EVENT_ID_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=EVENT_ID_CACHE.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, EVENT_ID_CACHE)
+
+
+def update_cache(event_group, event_ids):
+    """Merge newly discovered IDs for one event group into the cache file."""
+    with _cache_lock:
+        cache = load_cache()
+        cache.setdefault(event_group, {}).update(event_ids)
+        save_cache(cache)
+
+
+def fetch_page(url):
+    """
+    Fetch a leaderboard page over HTTP and parse it.
+    
+    The list view is rendered server-side, so no browser is needed in the
+    common case. Returns None on HTTP failure.
+    """
+    try:
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"    HTTP error fetching {url}: {e}")
+        return None
+    
+    return BeautifulSoup(response.content, 'lxml')
+
+
+def parse_event_options(soup):
+    """Return (value, text) pairs for every option of the #event dropdown."""
+    return [
+        (opt.get('value') or '', opt.get_text().strip())
+        for opt in soup.select('select#event option')
+    ]
+
+
+def fetch_event_options(driver, event_group):
+    """Return the #event dropdown options for a venue, via HTTP or the browser."""
+    url = f"{BASE_URL}index.php?event_main_group={event_group.replace(' ', '+')}&pid=list"
+    
+    print(f"  Discovering event IDs from: {url}")
+    
+    soup = fetch_page(url)
+    options = parse_event_options(soup) if soup else []
+    
+    if not options:
+        # Imported here so HTTP-only scrapers can use this module without selenium
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        # Fallback: let the browser render the dropdown
+        driver.get(url)
+        
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.ID, 'event'))
+            )
+            # Pull the whole dropdown in one call and parse the options locally
+            html = driver.execute_script("return document.getElementById('event').outerHTML")
+            options = parse_event_options(BeautifulSoup(html, 'lxml'))
+        except Exception as e:
+            print(f"    Error discovering event IDs: {e}")
+    
+    return options
+
+
+def _find_station_event(options):
+    """Pick the HYROX Individual event ID (H_*, not HWC_*) for station rankings."""
+    # First priority: Find "H_*_OVERALL" (regular HYROX Individual Overall)
+    for value, text in options:
+        if text == 'HYROX - Overall' and value.startswith('H_') and not value.startswith('HWC'):
+            return value
+    
+    # Second priority: Any H_* that's not Pro, Doubles, or World Championship
+    for value, text in options:
+        if value.startswith('H_') and not value.startswith('HWC') and not value.startswith('HDP') and 'DOUBLES' not in text and 'PRO' not in text:
+            return value
+    
+    return None
+
+
+def discover_event_ids(driver, event_group, want=('pro', 'individual')):
+    """
+    Discover event IDs for a venue from its dropdown.
+    
+    Args:
+        driver: WebDriver used only if the HTTP fetch yields no options
+        event_group: Venue event group (e.g. '2025 London')
+        want: Kinds to look up: 'pro', 'individual' and/or 'station'
+    
+    Returns:
+        Dict of {kind: event_id or None} for every requested kind
+    """
+    options = fetch_event_options(driver, event_group)
+    event_ids = dict.fromkeys(want)
+    
+    for value, text in options:
+        # Look for "HYROX PRO - Overall" (not Doubles, not day-specific)
+        if 'pro' in event_ids and 'HYROX PRO - Overall' in text and 'DOUBLES' not in text:
+            event_ids['pro'] = value
+            print(f"    Found Pro: {value}")
+        
+        # Look for "HYROX - Overall" (not Pro, not Doubles)
+        elif 'individual' in event_ids and text == 'HYROX - Overall':
+            event_ids['individual'] = value
+            print(f"    Found Individual: {value}")
+    
+    if 'station' in event_ids:
+        event_ids['station'] = _find_station_event(options)
+    
+    return event_ids
+
+
+def get_event_ids(driver, event_group, want=('pro', 'individual')):
+    """
+    Return event IDs for a venue, using the sidecar cache when available.
+    
+    Only found IDs are cached, so a kind that was not listed yet (e.g. an
+    event published after the first run) is looked up again next time.
+    """
+    cached = load_cache().get(event_group, {})
+    
+    if all(cached.get(kind) for kind in want):
+        print(f"  Using cached event IDs for {event_group}")
+        return {kind: cached[kind] for kind in want}
+    
+    event_ids = discover_event_ids(driver, event_group, want)
+    found = {kind: event_id for kind, event_id in event_ids.items() if event_id}
+    if found:
+        update_cache(event_group, found)
+    return {kind: event_ids[kind] or cached.get(kind) for kind in want}
+
+
+# Leaderboard page size (results per page) for the run-time scrapers
+RESULTS_PER_PAGE = 100
+
+# Serializes [rank, name, nationality, age_group, [times...]] for every result row
+JS_EXTRACT_RUN_ROWS = """
+(() => {
+    const text = (row, sel) => {
+        const el = row.querySelector(sel);
+        return el ? el.innerText.trim() : null;
+    };
+    return JSON.stringify(Array.from(document.querySelectorAll('li.list-active'), row => [
+        text(row, 'div.type-place'),
+        text(row, 'h4.type-fullname'),
+        text(row, 'span.type-nat') || 'N/A',
+        text(row, 'span.type-age_class') || 'N/A',
+        Array.from(row.querySelectorAll('div.type-time'), el => el.innerText),
+    ]));
+})()
+"""
+
+
+def _parse_html_row(row):
+    """Extract (rank, name, nationality, age_group, times) from a parsed row."""
+    rank_elem = row.select_one('div.type-place')
+    name_elem = row.select_one('h4.type-fullname')
+    nat_elem = row.select_one('span.type-nat')
+    age_elem = row.select_one('span.type-age_class')
+    
+    return (
+        rank_elem.get_text().strip() if rank_elem else None,
+        name_elem.get_text().strip() if name_elem else None,
+        nat_elem.get_text().strip() if nat_elem else "N/A",
+        age_elem.get_text().strip() if age_elem else "N/A",
+        [elem.get_text() for elem in row.select('div.type-time')],
+    )
+
+
+def evaluate_json(driver, expression):
+    """Evaluate a JS expression over CDP in one message and decode its JSON result."""
+    response = driver.execute_cdp_cmd('Runtime.evaluate', {
+        'expression': expression,
+        'returnByValue': True,
+    })
+    return json.loads(response['result']['value'])
+
+
+def _read_rows_with_driver(driver, url):
+    """Browser fallback: render the page and extract the same row tuples."""
+    # Imported here so HTTP-only scrapers can use this module without selenium
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    
+    driver.get(url)
+    
+    # Wait for results list
+    try:
+        WebDriverWait(driver, 8).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "li.list-active"))
+        )
+    except TimeoutException:
+        return []
+    
+    # One CDP message for the whole table instead of several per row
+    rows = evaluate_json(driver, JS_EXTRACT_RUN_ROWS)
+    return [tuple(row) for row in rows]
+
+
+def scrape_run_times_page(driver, url, venue_name, division, gender):
+    """
+    Scrape a single page of run time leaderboard.
+    
+    Returns (results, row_count); row_count counts every result row on the
+    page, including ones dropped for a missing name or run time.
+    """
+    results = []
+    rows = []
+    
+    try:
+        soup = fetch_page(url)
+        rows = [_parse_html_row(row) for row in soup.select('li.list-active')] if soup else []
+        
+        if not rows:
+            rows = _read_rows_with_driver(driver, url)
+        
+        parsed = []
+        for rank_text, name, nationality, age_group, time_texts in rows:
+            if not name:
+                continue
+            
+            # Rank
+            rank_text = (rank_text or '').replace('.', '')
+            rank = int(rank_text) if rank_text.isdigit() else None
+            
+            # Times - there should be two time columns when sorted by Run Total
+            run_total_str = time_texts[0] if len(time_texts) >= 1 else None
+            finish_total_str = time_texts[1] if len(time_texts) >= 2 else None
+            
+            parsed.append((rank, name, nationality, age_group, run_total_str, finish_total_str))
+        
+        # Convert all times for the page in one pass
+        run_seconds_list = parse_times_to_seconds([p[4] for p in parsed])
+        finish_seconds_list = parse_times_to_seconds([p[5] for p in parsed])
+        
+        for (rank, name, nationality, age_group, _, _), run_seconds, finish_seconds in zip(
+            parsed, run_seconds_list, finish_seconds_list
+        ):
+            if run_seconds:
+                results.append({
+                    'venue': venue_name,
+                    'division': division,
+                    'gender': 'M' if gender == 'M' else 'W',
+                    'rank': rank,
+                    'athlete_name': name,
+                    'nationality': nationality,
+                    'age_group': age_group,
+                    'run_total_seconds': run_seconds,
+                    'finish_total_seconds': finish_seconds
+                })
+                
+    except Exception as e:
+        print(f"    Error: {e}")
+    
+    return results, len(rows)
+
+
+def scrape_division(driver, venue_name, division_name, event_id, rate_limiter, max_results=200):
+    """Scrape a specific division (Pro or Individual) for both genders, sorted by Run Total."""
+    if not event_id:
+        print(f"  Skipping {division_name} (no event ID found)")
+        return []
+    
+    all_results = []
+    
+    for gender in ['M', 'W']:
+        gender_label = 'Men' if gender == 'M' else 'Women'
+        print(f"  {division_name} {gender_label}...")
+        
+        pages_to_scrape = max_results // RESULTS_PER_PAGE
+        
+        for page in range(1, pages_to_scrape + 1):
+            url = f"{BASE_URL}index.php?event={event_id}&ranking=time_49&num_results={RESULTS_PER_PAGE}&search[sex]={gender}&page={page}&pid=list"
+            
+            rate_limiter.wait()
+            page_results, row_count = scrape_run_times_page(driver, url, venue_name, division_name, gender)
+            
+            if not row_count:
+                print(f"    Page {page}: No results")
+                break
+            
+            all_results.extend(page_results)
+            print(f"    Page {page}: {len(page_results)} results")
+            
+            # A short page is the last one; skip fetching an empty next page.
+            # Count raw rows: dropped DNF/unparseable rows don't shorten the page.
+            if row_count < RESULTS_PER_PAGE:
+                break
+    
+    return all_results
+
+
+def init_run_times_db(db_path):
+    """
+    Create the pro_run_times table and its unique index if missing.
+    
+    Both run-time scrapers insert with INSERT OR IGNORE, which only skips
+    re-scraped rows once idx_pro_unique exists.
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pro_run_times (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            venue TEXT,
+            division TEXT,
+            gender TEXT,
+            rank INTEGER,
+            athlete_name TEXT,
+            nationality TEXT,
+            age_group TEXT,
+            run_total_seconds INTEGER,
+            finish_total_seconds INTEGER,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Drop duplicates left by earlier runs so the unique index can be built
+    cursor.execute('''
+        DELETE FROM pro_run_times
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM pro_run_times
+            GROUP BY venue, division, gender, rank, athlete_name
+        )
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_pro_unique
+        ON pro_run_times(venue, division, gender, rank, athlete_name)
+    ''')
+    
+    conn.commit()
+    conn.close()
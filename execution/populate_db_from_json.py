@@ -52,8 +52,9 @@ def populate_db():
                         r['finish_seconds']
                     ))
                 
+                # OR REPLACE: race_results may carry a unique (venue, gender, rank, name) index
                 cursor.executemany('''
-                    INSERT INTO race_results (
+                    INSERT OR REPLACE INTO race_results (
                         venue, event_id, location, region, gender, rank, name, nationality, age_group, finish_time, finish_seconds
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', rows)
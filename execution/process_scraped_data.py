@@ -9,6 +9,7 @@ This script:
 5. Exports to CSV for analysis
 """
 
+import gzip
 import json
 import pandas as pd
 from pathlib import Path
@@ -68,12 +69,14 @@ def process_scraped_data(input_file, output_file):
     Process scraped venue data and export to CSV.
     
     Args:
-        input_file: Path to raw JSON file from browser scraping
+        input_file: Path to raw JSON (or gzip-compressed .json.gz) file from browser scraping
         output_file: Path to output CSV file
     """
     print(f"Loading scraped data from {input_file}...")
     
-    with open(input_file, 'r') as f:
+    # Raw scrapes are written gzip-compressed; plain JSON is still accepted
+    opener = gzip.open if Path(input_file).suffix == '.gz' else open
+    with opener(input_file, 'rt') as f:
         raw_data = json.load(f)
     
     # Load venue metadata
@@ -168,7 +171,9 @@ def process_scraped_data(input_file, output_file):
 
 if __name__ == '__main__':
     # File paths
-    input_file = Path(__file__).parent.parent / '.tmp' / 'hyrox_scraped_raw.json'
+    input_file = Path(__file__).parent.parent / '.tmp' / 'hyrox_scraped_raw.json.gz'
+    if not input_file.exists():
+        input_file = input_file.with_suffix('')  # Older uncompressed scrape
     output_file = Path(__file__).parent.parent / 'data' / 'hyrox_9venues_100each.csv'
     
     # Ensure output directory exists
@@ -15,17 +15,21 @@ import csv
 import json
 import os
 import re
-import time
+import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
 from urllib.parse import urlencode
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+from hyrox_common import RateLimiter
+
 
 # Load environment variables
 load_dotenv()
@@ -53,6 +57,25 @@ DIVISIONS = {
     'women': 'W',
 }
 
+# Maximum request rate against the results server
+REQUESTS_PER_SECOND = 1 / 1.5
+
+# Shared instances for low-cardinality text fields (nationality, age group)
+_STRING_CACHE: Dict[str, str] = {}
+
+
+def _shared(value: str) -> str:
+    """Return a canonical instance of a repeated string value."""
+    if value is None:
+        return None
+    return _STRING_CACHE.setdefault(value, value)
+
+
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+
+# Shared HTTP session so consecutive page fetches reuse one keep-alive connection
+_session = requests.Session()
+
 
 def build_results_url(event_config: Dict, gender: str, page: int = 1, 
                      num_results: int = 100) -> str:
@@ -118,6 +141,49 @@ def parse_time_to_seconds(time_str: str) -> float:
         return None
 
 
+def _field_xpath(css_class: str) -> str:
+    """XPath for the text of the first results field div with the given class."""
+    return f"string((.//div[@class='list-field {css_class}'])[1])"
+
+
+# Row schema is fixed, so every field lookup is compiled once at import time
+_RESULTS_TABLE = etree.XPath(
+    "(//div[contains(concat(' ', normalize-space(@class), ' '), ' list-box ')])[1]"
+)
+_RESULT_ROWS = etree.XPath(
+    ".//li[contains(concat(' ', normalize-space(@class), ' '), ' list-active ')]"
+)
+_RANK = etree.XPath(_field_xpath('type-field'))
+# Athlete link text when present, otherwise the whole name field
+_NAME = etree.XPath(
+    "string((.//div[@class='list-field type-fullname'])[1]//a"
+    " | (.//div[@class='list-field type-fullname'])[1][not(.//a)])"
+)
+_NATION = etree.XPath(_field_xpath('type-nation'))
+_AGE_CLASS = etree.XPath(_field_xpath('type-age_class'))
+_TIME = etree.XPath(_field_xpath('type-time'))
+
+
+def parse_row(row) -> tuple:
+    """
+    Extract the fixed result fields from a single result row.
+    
+    Args:
+        row: lxml element for an ``li.list-active`` row
+    
+    Returns:
+        Tuple of (rank, athlete_name, nationality, age_group, finish_time),
+        with missing fields as None
+    """
+    return (
+        _RANK(row).strip() or None,
+        _NAME(row).strip() or None,
+        _NATION(row).strip() or None,
+        _AGE_CLASS(row).strip() or None,
+        _TIME(row).strip() or None,
+    )
+
+
 def scrape_results_page(url: str, event_name: str, division_name: str) -> List[Dict[str, Any]]:
     """
     Scrape a single results page.
@@ -131,51 +197,31 @@ def scrape_results_page(url: str, event_name: str, division_name: str) -> List[D
         List of athlete result dictionaries
     """
     try:
-        response = requests.get(url, timeout=30)
+        _rate_limiter.wait()
+        response = _session.get(url, timeout=30)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"❌ Error fetching {url}: {e}")
         return []
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    tree = lxml.html.fromstring(response.content)
     
     # Find results table
-    results_table = soup.find('div', class_='list-box')
-    if not results_table:
+    results_tables = _RESULTS_TABLE(tree)
+    if not results_tables:
         print(f"⚠️  No results table found at {url}")
         return []
     
     # Find all result rows
-    result_rows = results_table.find_all('li', class_='list-active')
+    result_rows = _RESULT_ROWS(results_tables[0])
     
     results = []
     
     for row in result_rows:
         try:
-            # Extract data from row
-            # Rank
-            rank_div_elem = row.find('div', class_='list-field type-field')
-            rank_div = rank_div_elem.text.strip() if rank_div_elem else None
-            
-            # Name
-            name_elem = row.find('div', class_='list-field type-fullname')
-            if name_elem:
-                name_link = name_elem.find('a')
-                athlete_name = name_link.text.strip() if name_link else name_elem.text.strip()
-            else:
-                athlete_name = None
-            
-            # Nationality
-            nat_elem = row.find('div', class_='list-field type-nation')
-            nationality = nat_elem.text.strip() if nat_elem else None
-            
-            # Age Group
-            age_elem = row.find('div', class_='list-field type-age_class')
-            age_group = age_elem.text.strip() if age_elem else None
-            
-            # Total Time (finish time)
-            time_elem = row.find('div', class_='list-field type-time')
-            finish_time_str = time_elem.text.strip() if time_elem else None
+            rank_div, athlete_name, nationality, age_group, finish_time_str = parse_row(row)
+            nationality = _shared(nationality)
+            age_group = _shared(age_group)
             finish_time_seconds = parse_time_to_seconds(finish_time_str)
             
             if athlete_name and finish_time_seconds:
@@ -209,7 +255,7 @@ def scrape_event(event_key: str, top_n: int = 200) -> List[Dict[str, Any]]:
         List of all results for this event
     """
     event_config = SEASON_8_EVENTS[event_key]
-    event_name = event_config['name']
+    event_name = sys.intern(event_config['name'])
     
     print(f"\n{'='*60}")
     print(f"Scraping: {event_name}")
@@ -221,7 +267,7 @@ def scrape_event(event_key: str, top_n: int = 200) -> List[Dict[str, Any]]:
     pages_needed = (top_n + 99) // 100  # Ceiling division
     
     for division_key, gender_code in DIVISIONS.items():
-        division_name = f"{division_key.capitalize()} Individual"
+        division_name = sys.intern(f"{division_key.capitalize()} Individual")
         print(f"\n{division_name}:")
         
         division_results = []
@@ -235,9 +281,6 @@ def scrape_event(event_key: str, top_n: int = 200) -> List[Dict[str, Any]]:
             
             print(f"    Found {len(page_results)} results")
             
-            # Rate limiting
-            time.sleep(1.5)
-            
             # Stop if we have enough results
             if len(division_results) >= top_n:
                 division_results = division_results[:top_n]
@@ -295,6 +338,21 @@ def consolidate_results(all_results: List[Dict[str, Any]]) -> None:
     print(f"{'='*60}")
 
 
+def summarize_results(all_results: List[Dict[str, Any]]):
+    """
+    Count this run's results per event and per division.
+    
+    Args:
+        all_results: List of all athlete results across events
+    
+    Returns:
+        Tuple of (event_counts, division_counts) Counters
+    """
+    event_counts = Counter(r['event_name'] for r in all_results)
+    division_counts = Counter(r['division'] for r in all_results)
+    return event_counts, division_counts
+
+
 def main():
     parser = argparse.ArgumentParser(description='Scrape HYROX Season 8 results')
     parser.add_argument('--venues', nargs='+', 
@@ -339,10 +397,8 @@ def main():
     print(f"Venues processed: {len(venues)}")
     print(f"Total results: {len(all_results)}")
     
-    # Breakdown by event and division
-    from collections import Counter
-    event_counts = Counter(r['event_name'] for r in all_results)
-    division_counts = Counter(r['division'] for r in all_results)
+    # Breakdown by event and division (this run only, not a stale CSV)
+    event_counts, division_counts = summarize_results(all_results)
     
     print("\nBy Event:")
     for event, count in event_counts.items():
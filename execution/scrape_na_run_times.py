@@ -3,23 +3,26 @@
 Scrape ONLY North American venues (incremental update).
 """
 
-import json
-import time
+import operator
 import sqlite3
 import csv
 from pathlib import Path
 from datetime import datetime
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from hyrox_common import LazyDriver, RateLimiter, get_event_ids, init_run_times_db, scrape_division
 
 DB_PATH = Path('data/hyrox_results.db')
 CSV_OUTPUT = Path('data/pro_run_times.csv')
-BASE_URL = 'https://results.hyrox.com/season-8/'
+
+CSV_FIELDS = (
+    'venue', 'division', 'gender', 'rank', 'athlete_name',
+    'nationality', 'age_group', 'run_total_seconds', 'finish_total_seconds'
+)
+CSV_BUFFER_SIZE = 1 << 20
+_csv_row = operator.itemgetter(*CSV_FIELDS)
+
+# Maximum leaderboard page request rate
+REQUESTS_PER_SECOND = 1 / 1.5
 
 # North America only (excluding Mexico)
 NA_VENUES = [
@@ -32,165 +35,7 @@ NA_VENUES = [
 ]
 
 
-def parse_time_to_seconds(time_str):
-    if not time_str:
-        return None
-    try:
-        time_str = time_str.strip().replace('Run Total', '').replace('Total', '').strip()
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        elif len(parts) == 2:
-            return int(parts[0]) * 60 + int(parts[1])
-    except:
-        return None
-    return None
-
-
-def discover_event_ids(driver, venue_config):
-    event_group = venue_config['event_group']
-    url = f"{BASE_URL}index.php?event_main_group={event_group.replace(' ', '+')}&pid=list"
-    
-    print(f"  Discovering event IDs from: {url}")
-    
-    driver.get(url)
-    time.sleep(3)
-    
-    event_ids = {'pro': None, 'individual': None}
-    
-    try:
-        dropdown = driver.find_element(By.ID, 'event')
-        options = dropdown.find_elements(By.TAG_NAME, 'option')
-        
-        for opt in options:
-            value = opt.get_attribute('value')
-            text = opt.text.strip()
-            
-            if 'HYROX PRO - Overall' in text and 'DOUBLES' not in text:
-                event_ids['pro'] = value
-                print(f"    Found Pro: {value}")
-            
-            if text == 'HYROX - Overall':
-                event_ids['individual'] = value
-                print(f"    Found Individual: {value}")
-                
-    except Exception as e:
-        print(f"    Error discovering event IDs: {e}")
-    
-    return event_ids
-
-
-def scrape_run_times_page(driver, url, venue_name, division, gender):
-    results = []
-    
-    try:
-        driver.get(url)
-        time.sleep(2.5)
-        
-        try:
-            WebDriverWait(driver, 8).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "li.list-active"))
-            )
-        except TimeoutException:
-            return []
-        
-        rows = driver.find_elements(By.CSS_SELECTOR, "li.list-active")
-        
-        for row in rows:
-            try:
-                try:
-                    rank_elem = row.find_element(By.CSS_SELECTOR, "div.type-place")
-                    rank_text = rank_elem.text.strip().replace('.', '')
-                    rank = int(rank_text) if rank_text.isdigit() else None
-                except:
-                    rank = None
-                
-                try:
-                    name_elem = row.find_element(By.CSS_SELECTOR, "h4.type-fullname")
-                    name = name_elem.text.strip()
-                except:
-                    name = None
-                
-                if not name:
-                    continue
-                
-                try:
-                    nat_elem = row.find_element(By.CSS_SELECTOR, "span.type-nat")
-                    nationality = nat_elem.text.strip()
-                except:
-                    nationality = "N/A"
-                
-                try:
-                    age_elem = row.find_element(By.CSS_SELECTOR, "span.type-age_class")
-                    age_group = age_elem.text.strip()
-                except:
-                    age_group = "N/A"
-                
-                time_elems = row.find_elements(By.CSS_SELECTOR, "div.type-time")
-                
-                run_total_str = None
-                finish_total_str = None
-                
-                if len(time_elems) >= 2:
-                    run_total_str = time_elems[0].text
-                    finish_total_str = time_elems[1].text
-                elif len(time_elems) == 1:
-                    run_total_str = time_elems[0].text
-                
-                run_seconds = parse_time_to_seconds(run_total_str)
-                finish_seconds = parse_time_to_seconds(finish_total_str)
-                
-                if name and run_seconds:
-                    results.append({
-                        'venue': venue_name,
-                        'division': division,
-                        'gender': 'M' if gender == 'M' else 'W',
-                        'rank': rank,
-                        'athlete_name': name,
-                        'nationality': nationality,
-                        'age_group': age_group,
-                        'run_total_seconds': run_seconds,
-                        'finish_total_seconds': finish_seconds
-                    })
-                    
-            except Exception as e:
-                continue
-                
-    except Exception as e:
-        print(f"    Error: {e}")
-    
-    return results
-
-
-def scrape_division(driver, venue_name, division_name, event_id, max_results=200):
-    if not event_id:
-        print(f"  Skipping {division_name} (no event ID found)")
-        return []
-    
-    all_results = []
-    
-    for gender in ['M', 'W']:
-        gender_label = 'Men' if gender == 'M' else 'Women'
-        print(f"  {division_name} {gender_label}...")
-        
-        pages_to_scrape = max_results // 100
-        
-        for page in range(1, pages_to_scrape + 1):
-            url = f"{BASE_URL}index.php?event={event_id}&ranking=time_49&num_results=100&search[sex]={gender}&page={page}&pid=list"
-            
-            page_results = scrape_run_times_page(driver, url, venue_name, division_name, gender)
-            
-            if not page_results:
-                print(f"    Page {page}: No results")
-                break
-            
-            all_results.extend(page_results)
-            print(f"    Page {page}: {len(page_results)} results")
-            
-            time.sleep(1.5)
-    
-    return all_results
-
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
 
 def scrape_venue(driver, venue_config):
     venue_name = venue_config['name']
@@ -198,7 +43,7 @@ def scrape_venue(driver, venue_config):
     print(f"Scraping: {venue_name}")
     print(f"{'='*50}")
     
-    event_ids = discover_event_ids(driver, venue_config)
+    event_ids = get_event_ids(driver, venue_config['event_group'])
     
     if not event_ids['pro'] and not event_ids['individual']:
         print(f"  No event IDs found for {venue_name}. Skipping.")
@@ -206,10 +51,10 @@ def scrape_venue(driver, venue_config):
     
     all_results = []
     
-    pro_results = scrape_division(driver, venue_name, 'Pro', event_ids['pro'], max_results=200)
+    pro_results = scrape_division(driver, venue_name, 'Pro', event_ids['pro'], _rate_limiter, max_results=200)
     all_results.extend(pro_results)
     
-    individual_results = scrape_division(driver, venue_name, 'Individual', event_ids['individual'], max_results=200)
+    individual_results = scrape_division(driver, venue_name, 'Individual', event_ids['individual'], _rate_limiter, max_results=200)
     all_results.extend(individual_results)
     
     print(f"  Total for {venue_name}: {len(all_results)} records")
@@ -236,39 +81,54 @@ def save_to_db(results):
         datetime.now().isoformat()
     ) for r in results]
     
+    # Rows already stored by a previous run are skipped (idx_pro_unique, see init_run_times_db)
     cursor.executemany('''
-        INSERT INTO pro_run_times (
+        INSERT OR IGNORE INTO pro_run_times (
             venue, division, gender, rank, athlete_name, nationality, age_group,
             run_total_seconds, finish_total_seconds, scraped_at
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ''', rows)
     
+    inserted = cursor.rowcount
     conn.commit()
     conn.close()
-    return len(rows)
+    return inserted
 
 
 def save_to_csv(results):
     if not results:
         return
     
+    # Header only when starting a new file
+    write_header = not CSV_OUTPUT.exists()
+    
     # Append to existing CSV
-    with open(CSV_OUTPUT, 'a', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            'venue', 'division', 'gender', 'rank', 'athlete_name', 
-            'nationality', 'age_group', 'run_total_seconds', 'finish_total_seconds'
-        ])
-        writer.writerows(results)
+    with open(CSV_OUTPUT, 'a', newline='', buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(CSV_FIELDS)
+        writer.writerows(map(_csv_row, results))
+
+
+def summarize_db(venues):
+    """Count stored records per venue and division directly in SQLite."""
+    conn = sqlite3.connect(DB_PATH)
+    placeholders = ','.join('?' * len(venues))
+    rows = conn.execute(f'''
+        SELECT venue, division, COUNT(*)
+        FROM pro_run_times
+        WHERE venue IN ({placeholders})
+        GROUP BY venue, division
+        ORDER BY venue, division
+    ''', venues).fetchall()
+    conn.close()
+    return rows
 
 
 def main():
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--window-size=1920,1080')
-    
-    driver = webdriver.Chrome(options=options)
+    # Ensures the unique index save_to_db relies on, even if the Pro scraper never ran
+    init_run_times_db(DB_PATH)
+    driver = LazyDriver()
     
     total_results = 0
     
@@ -288,6 +148,10 @@ def main():
     print(f"\n{'='*50}")
     print(f"=== NA SCRAPING COMPLETE ===")
     print(f"Total new records: {total_results}")
+    
+    print("\nStored records by venue/division:")
+    for venue, division, count in summarize_db([v['name'] for v in NA_VENUES]):
+        print(f"  {venue} - {division}: {count}")
     print(f"{'='*50}")
 
 
@@ -11,24 +11,34 @@ Usage:
     python scrape_pro_run_times.py
 """
 
-import json
-import time
+import operator
+import threading
 import sqlite3
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from hyrox_common import LazyDriver, RateLimiter, get_event_ids, init_run_times_db, scrape_division
 
 # Configuration
 DB_PATH = Path('data/hyrox_results.db')
 CSV_OUTPUT = Path('data/pro_run_times.csv')
-BASE_URL = 'https://results.hyrox.com/season-8/'
+
+CSV_FIELDS = (
+    'venue', 'division', 'gender', 'rank', 'athlete_name',
+    'nationality', 'age_group', 'run_total_seconds', 'finish_total_seconds'
+)
+_csv_row = operator.itemgetter(*CSV_FIELDS)
+
+# Maximum leaderboard page request rate
+REQUESTS_PER_SECOND = 1 / 1.5
+
+# Venues scraped concurrently (each worker starts Chrome only if it needs the render fallback)
+MAX_WORKERS = 4
+
+# Assumed row count for venues not yet in the database (used for scheduling)
+DEFAULT_EXPECTED_SIZE = 200
 
 # Pilot venues - European cluster + North America (excluding Mexico)
 PILOT_VENUES = [
@@ -53,203 +63,11 @@ PILOT_VENUES = [
 
 def init_db():
     """Initialize SQLite database with pro_run_times table."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS pro_run_times (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            venue TEXT,
-            division TEXT,
-            gender TEXT,
-            rank INTEGER,
-            athlete_name TEXT,
-            nationality TEXT,
-            age_group TEXT,
-            run_total_seconds INTEGER,
-            finish_total_seconds INTEGER,
-            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    init_run_times_db(DB_PATH)
     print("Database initialized.")
 
 
-def parse_time_to_seconds(time_str):
-    """Convert HH:MM:SS or MM:SS to seconds."""
-    if not time_str:
-        return None
-    try:
-        # Clean the string
-        time_str = time_str.strip().replace('Run Total', '').replace('Total', '').strip()
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        elif len(parts) == 2:
-            return int(parts[0]) * 60 + int(parts[1])
-    except:
-        return None
-    return None
-
-
-def discover_event_ids(driver, venue_config):
-    """Navigate to venue page and discover available event IDs from dropdown."""
-    event_group = venue_config['event_group']
-    url = f"{BASE_URL}index.php?event_main_group={event_group.replace(' ', '+')}&pid=list"
-    
-    print(f"  Discovering event IDs from: {url}")
-    
-    driver.get(url)
-    time.sleep(3)  # Wait for JS
-    
-    event_ids = {'pro': None, 'individual': None}
-    
-    try:
-        # Find the event dropdown
-        dropdown = driver.find_element(By.ID, 'event')
-        options = dropdown.find_elements(By.TAG_NAME, 'option')
-        
-        for opt in options:
-            value = opt.get_attribute('value')
-            text = opt.text.strip()
-            
-            # Look for "HYROX PRO - Overall" (not Doubles, not day-specific)
-            if 'HYROX PRO - Overall' in text and 'DOUBLES' not in text:
-                event_ids['pro'] = value
-                print(f"    Found Pro: {value}")
-            
-            # Look for "HYROX - Overall" (not Pro, not Doubles)
-            if text == 'HYROX - Overall':
-                event_ids['individual'] = value
-                print(f"    Found Individual: {value}")
-                
-    except Exception as e:
-        print(f"    Error discovering event IDs: {e}")
-    
-    return event_ids
-
-
-def scrape_run_times_page(driver, url, venue_name, division, gender):
-    """Scrape a single page of run time leaderboard."""
-    results = []
-    
-    try:
-        driver.get(url)
-        time.sleep(2.5)  # Wait for JS
-        
-        # Wait for results list
-        try:
-            WebDriverWait(driver, 8).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "li.list-active"))
-            )
-        except TimeoutException:
-            return []
-        
-        rows = driver.find_elements(By.CSS_SELECTOR, "li.list-active")
-        
-        for row in rows:
-            try:
-                # Rank
-                try:
-                    rank_elem = row.find_element(By.CSS_SELECTOR, "div.type-place")
-                    rank_text = rank_elem.text.strip().replace('.', '')
-                    rank = int(rank_text) if rank_text.isdigit() else None
-                except:
-                    rank = None
-                
-                # Name
-                try:
-                    name_elem = row.find_element(By.CSS_SELECTOR, "h4.type-fullname")
-                    name = name_elem.text.strip()
-                except:
-                    name = None
-                
-                if not name:
-                    continue
-                
-                # Nationality
-                try:
-                    nat_elem = row.find_element(By.CSS_SELECTOR, "span.type-nat")
-                    nationality = nat_elem.text.strip()
-                except:
-                    nationality = "N/A"
-                
-                # Age Group
-                try:
-                    age_elem = row.find_element(By.CSS_SELECTOR, "span.type-age_class")
-                    age_group = age_elem.text.strip()
-                except:
-                    age_group = "N/A"
-                
-                # Times - there should be two time columns when sorted by Run Total
-                time_elems = row.find_elements(By.CSS_SELECTOR, "div.type-time")
-                
-                run_total_str = None
-                finish_total_str = None
-                
-                if len(time_elems) >= 2:
-                    run_total_str = time_elems[0].text
-                    finish_total_str = time_elems[1].text
-                elif len(time_elems) == 1:
-                    run_total_str = time_elems[0].text
-                
-                run_seconds = parse_time_to_seconds(run_total_str)
-                finish_seconds = parse_time_to_seconds(finish_total_str)
-                
-                if name and run_seconds:
-                    results.append({
-                        'venue': venue_name,
-                        'division': division,
-                        'gender': 'M' if gender == 'M' else 'W',
-                        'rank': rank,
-                        'athlete_name': name,
-                        'nationality': nationality,
-                        'age_group': age_group,
-                        'run_total_seconds': run_seconds,
-                        'finish_total_seconds': finish_seconds
-                    })
-                    
-            except Exception as e:
-                continue
-                
-    except Exception as e:
-        print(f"    Error: {e}")
-    
-    return results
-
-
-def scrape_division(driver, venue_name, division_name, event_id, max_results=200):
-    """Scrape a specific division (Pro or Individual) for both genders."""
-    if not event_id:
-        print(f"  Skipping {division_name} (no event ID found)")
-        return []
-    
-    all_results = []
-    
-    for gender in ['M', 'W']:
-        gender_label = 'Men' if gender == 'M' else 'Women'
-        print(f"  {division_name} {gender_label}...")
-        
-        pages_to_scrape = max_results // 100  # 100 results per page
-        
-        for page in range(1, pages_to_scrape + 1):
-            url = f"{BASE_URL}index.php?event={event_id}&ranking=time_49&num_results=100&search[sex]={gender}&page={page}&pid=list"
-            
-            page_results = scrape_run_times_page(driver, url, venue_name, division_name, gender)
-            
-            if not page_results:
-                print(f"    Page {page}: No results")
-                break
-            
-            all_results.extend(page_results)
-            print(f"    Page {page}: {len(page_results)} results")
-            
-            time.sleep(1.5)  # Rate limit
-    
-    return all_results
-
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
 
 def scrape_venue(driver, venue_config):
     """Scrape all divisions for a venue."""
@@ -259,7 +77,7 @@ def scrape_venue(driver, venue_config):
     print(f"{'='*50}")
     
     # Step 1: Discover event IDs
-    event_ids = discover_event_ids(driver, venue_config)
+    event_ids = get_event_ids(driver, venue_config['event_group'])
     
     if not event_ids['pro'] and not event_ids['individual']:
         print(f"  No event IDs found for {venue_name}. Skipping.")
@@ -268,25 +86,41 @@ def scrape_venue(driver, venue_config):
     all_results = []
     
     # Step 2: Scrape Pro
-    pro_results = scrape_division(driver, venue_name, 'Pro', event_ids['pro'], max_results=200)
+    pro_results = scrape_division(driver, venue_name, 'Pro', event_ids['pro'], _rate_limiter, max_results=200)
     all_results.extend(pro_results)
     
     # Step 3: Scrape Individual
-    individual_results = scrape_division(driver, venue_name, 'Individual', event_ids['individual'], max_results=200)
+    individual_results = scrape_division(driver, venue_name, 'Individual', event_ids['individual'], _rate_limiter, max_results=200)
     all_results.extend(individual_results)
     
     print(f"  Total for {venue_name}: {len(all_results)} records")
     return all_results
 
 
-def save_to_db(results):
-    """Save results to SQLite database."""
+# Rows already stored (same venue/division/gender/rank/athlete) are skipped
+INSERT_SQL = '''
+    INSERT OR IGNORE INTO pro_run_times (
+        venue, division, gender, rank, athlete_name, nationality, age_group,
+        run_total_seconds, finish_total_seconds, scraped_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def open_db():
+    """Open a single autocommit connection tuned for bulk inserts."""
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def save_to_db(conn, results):
+    """Save results to SQLite database in a single transaction."""
     if not results:
         return 0
-        
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
     
+    scraped_at = datetime.now().isoformat()
     rows = [(
         r['venue'],
         r['division'],
@@ -297,37 +131,84 @@ def save_to_db(results):
         r['age_group'],
         r['run_total_seconds'],
         r['finish_total_seconds'],
-        datetime.now().isoformat()
+        scraped_at
     ) for r in results]
     
-    cursor.executemany('''
-        INSERT INTO pro_run_times (
-            venue, division, gender, rank, athlete_name, nationality, age_group,
-            run_total_seconds, finish_total_seconds, scraped_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', rows)
-    
-    conn.commit()
-    conn.close()
-    return len(rows)
+    conn.execute("BEGIN")
+    try:
+        inserted = conn.executemany(INSERT_SQL, rows).rowcount
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return inserted
 
 
-def save_to_csv(results, append=False):
-    """Save results to CSV file."""
+def save_to_csv(results):
+    """Write all results to the CSV file in one pass, replacing any previous run."""
     if not results:
         return
-        
-    mode = 'a' if append else 'w'
-    write_header = not append or not CSV_OUTPUT.exists()
     
-    with open(CSV_OUTPUT, mode, newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            'venue', 'division', 'gender', 'rank', 'athlete_name', 
-            'nationality', 'age_group', 'run_total_seconds', 'finish_total_seconds'
-        ])
-        if write_header:
-            writer.writeheader()
-        writer.writerows(results)
+    rows = list(map(_csv_row, results))
+    
+    with open(CSV_OUTPUT, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(rows)
+
+
+def expected_venue_sizes():
+    """Return {venue name: row count} from the previous run's pro_run_times rows."""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return dict(conn.execute(
+            "SELECT venue, COUNT(*) FROM pro_run_times GROUP BY venue"
+        ).fetchall())
+    finally:
+        conn.close()
+
+
+def schedule_venues(venues):
+    """
+    Order venues largest-first for the worker pool.
+    
+    Starting the longest jobs first keeps a big venue from being picked up
+    last while the other workers sit idle, which shortens the overall run.
+    """
+    sizes = expected_venue_sizes()
+    return sorted(
+        venues,
+        key=lambda v: sizes.get(v['name'], DEFAULT_EXPECTED_SIZE),
+        reverse=True
+    )
+
+
+def scrape_venues_parallel(venues, max_workers=MAX_WORKERS):
+    """
+    Scrape venues concurrently with a pool of WebDrivers.
+    
+    Drivers are not thread-safe, so each worker thread lazily creates its own
+    and reuses it for every venue it picks up. Yields (venue_config, results)
+    in venue order so the caller can persist from a single thread.
+    """
+    local = threading.local()
+    drivers = []
+    drivers_lock = threading.Lock()
+    
+    def scrape_one(venue_config):
+        driver = getattr(local, 'driver', None)
+        if driver is None:
+            driver = local.driver = LazyDriver()
+            with drivers_lock:
+                drivers.append(driver)
+        return venue_config, scrape_venue(driver, venue_config)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield from pool.map(scrape_one, venues)
+    finally:
+        for driver in drivers:
+            driver.quit()
 
 
 def main():
@@ -338,29 +219,21 @@ def main():
     if CSV_OUTPUT.exists():
         CSV_OUTPUT.unlink()
     
-    # Setup Selenium
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--window-size=1920,1080')
-    
-    driver = webdriver.Chrome(options=options)
+    all_results = []
     
-    total_results = 0
+    for venue_config, venue_results in scrape_venues_parallel(schedule_venues(PILOT_VENUES)):
+        if venue_results:
+            all_results.extend(venue_results)
+            print(f"  Scraped {len(venue_results)} records ({venue_config['name']}).")
     
+    # One insert transaction for the whole run
+    conn = open_db()
     try:
-        for venue_config in PILOT_VENUES:
-            venue_results = scrape_venue(driver, venue_config)
-            
-            if venue_results:
-                count = save_to_db(venue_results)
-                save_to_csv(venue_results, append=True)
-                total_results += count
-                print(f"  Saved {count} records.")
-            
+        total_results = save_to_db(conn, all_results)
     finally:
-        driver.quit()
+        conn.close()
+    
+    save_to_csv(all_results)
     
     print(f"\n{'='*50}")
     print(f"=== SCRAPING COMPLETE ===")
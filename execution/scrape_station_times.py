@@ -7,22 +7,27 @@ Ranks: 50, 100, 150, 200
 Venues: 1 EU (London), 1 NA (Chicago), 4 slow (Johannesburg, Singapore, Mumbai, Delhi)
 """
 
+import operator
 import time
 import sqlite3
 import csv
 from pathlib import Path
 from datetime import datetime
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+from hyrox_common import (
+    BASE_URL, LazyDriver, evaluate_json, fetch_page, get_event_ids, parse_time_to_seconds,
+)
+
 DB_PATH = Path('data/hyrox_results.db')
 CSV_OUTPUT = Path('data/station_times_comparison.csv')
-BASE_URL = 'https://results.hyrox.com/season-8/'
+
+CSV_FIELDS = ('venue', 'venue_type', 'gender', 'station', 'rank', 'time_seconds')
+_csv_row = operator.itemgetter(*CSV_FIELDS)
 
 # Station ranking codes
 STATIONS = {
@@ -47,82 +52,54 @@ VENUES = [
     {'name': 'Delhi', 'event_group': '2025 Delhi', 'type': 'slow'},
 ]
 
+# Serializes station time text for the first {limit} result rows (null when missing)
+JS_EXTRACT_STATION_TIMES = """
+(() => {{
+    const rows = Array.from(document.querySelectorAll('li.list-active')).slice(0, {limit});
+    return JSON.stringify(rows.map(row => {{
+        const el = row.querySelector('div.type-actual_ranking_time');
+        return el ? el.innerText : null;
+    }}));
+}})()
+"""
 
-def parse_time_to_seconds(time_str):
-    """Convert MM:SS or HH:MM:SS to seconds."""
-    if not time_str:
-        return None
-    try:
-        time_str = time_str.strip()
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        elif len(parts) == 2:
-            return int(parts[0]) * 60 + int(parts[1])
-    except:
-        return None
-    return None
-
-
-def discover_event_id(driver, event_group):
-    """Navigate to venue and find the HYROX Individual event ID (H_*, not HWC_*)."""
-    url = f"{BASE_URL}index.php?event_main_group={event_group.replace(' ', '+')}&pid=list"
+
+def _read_station_times_with_driver(driver, url):
+    """Browser fallback: render the page and return station time text per row."""
     driver.get(url)
-    time.sleep(3)
     
-    try:
-        dropdown = driver.find_element(By.ID, 'event')
-        options = dropdown.find_elements(By.TAG_NAME, 'option')
-        
-        # First priority: Find "H_*_OVERALL" (regular HYROX Individual Overall)
-        for opt in options:
-            text = opt.text.strip()
-            value = opt.get_attribute('value')
-            if text == 'HYROX - Overall' and value.startswith('H_') and not value.startswith('HWC'):
-                return value
-        
-        # Second priority: Any H_* that's not Pro, Doubles, or World Championship
-        for opt in options:
-            value = opt.get_attribute('value')
-            text = opt.text.strip()
-            if value.startswith('H_') and not value.startswith('HWC') and not value.startswith('HDP') and 'DOUBLES' not in text and 'PRO' not in text:
-                return value
-                
-    except Exception as e:
-        print(f"  Error discovering event ID: {e}")
+    # Data rows have class 'list-active' (header has 'list-group-header')
+    WebDriverWait(driver, 8).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "li.list-active"))
+    )
     
-    return None
+    # One CDP message for the whole table instead of one per row
+    return evaluate_json(driver, JS_EXTRACT_STATION_TIMES.format(limit=SAMPLE_RANKS[-1]))
 
 
 def scrape_station_results(driver, event_id, station_code, gender='M', max_results=250):
     """Scrape station leaderboard and extract times at target ranks."""
     url = f"{BASE_URL}index.php?event={event_id}&ranking={station_code}&num_results={max_results}&search[sex]={gender}&pid=list"
     
-    driver.get(url)
-    time.sleep(2.5)
-    
     results = {}
     
     try:
-        # Data rows have class 'list-active' (header has 'list-group-header')
-        WebDriverWait(driver, 8).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "li.list-active"))
-        )
+        soup = fetch_page(url)
+        time_texts = []
+        if soup:
+            for row in soup.select('li.list-active'):
+                # Station time is in div.type-actual_ranking_time
+                time_elem = row.select_one('div.type-actual_ranking_time')
+                time_texts.append(time_elem.get_text() if time_elem else None)
         
-        rows = driver.find_elements(By.CSS_SELECTOR, "li.list-active")
+        if not time_texts:
+            time_texts = _read_station_times_with_driver(driver, url)
         
-        for i, row in enumerate(rows, 1):
+        for i, time_str in enumerate(time_texts, 1):
             if i in SAMPLE_RANKS:
-                try:
-                    # Station time is in div.type-actual_ranking_time
-                    time_elem = row.find_element(By.CSS_SELECTOR, "div.type-actual_ranking_time")
-                    time_str = time_elem.text.strip()
-                    # Remove "Time" label if present
-                    time_str = time_str.replace('Time', '').strip()
-                    time_seconds = parse_time_to_seconds(time_str)
-                    results[i] = time_seconds
-                except Exception as e:
-                    results[i] = None
+                # Remove "Time" label if present
+                time_str = (time_str or '').strip().replace('Time', '').strip()
+                results[i] = parse_time_to_seconds(time_str)
                     
     except TimeoutException:
         print(f"    Timeout")
@@ -142,8 +119,8 @@ def scrape_venue(driver, venue_config):
     print(f"Scraping: {venue_name} ({venue_type})")
     print(f"{'='*50}")
     
-    # Discover event ID
-    event_id = discover_event_id(driver, event_group)
+    # Discover event ID (cached across runs)
+    event_id = get_event_ids(driver, event_group, want=('station',))['station']
     if not event_id:
         print(f"  No event ID found. Skipping.")
         return []
@@ -170,7 +147,7 @@ def scrape_venue(driver, venue_config):
                     'time_seconds': time_seconds
                 })
             
-            time.sleep(1.5)
+            time.sleep(1.5)  # Rate limit
     
     return results
 
@@ -180,22 +157,18 @@ def save_results(all_results):
     if not all_results:
         return
     
+    rows = list(map(_csv_row, all_results))
+    
     with open(CSV_OUTPUT, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['venue', 'venue_type', 'gender', 'station', 'rank', 'time_seconds'])
-        writer.writeheader()
-        writer.writerows(all_results)
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(rows)
     
     print(f"\nSaved {len(all_results)} records to {CSV_OUTPUT}")
 
 
 def main():
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--window-size=1920,1080')
-    
-    driver = webdriver.Chrome(options=options)
+    driver = LazyDriver()
     
     all_results = []
     
@@ -15,9 +15,12 @@ Examples:
     python scrape_venues.py --venues anaheim,london --limit 50  # Scrape 2 venues, 50 results each
 """
 
+import gzip
 import json
+import threading
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -25,6 +28,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from hyrox_common import BLOCKED_CONTENT_PREFS, BLOCKED_URL_PATTERNS
+
 
 class HyroxScraper:
     """Scraper for HYROX results data."""
@@ -38,8 +43,13 @@ class HyroxScraper:
             options.add_argument('--headless')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
+        # Only the results HTML is needed; skip images, stylesheets and fonts
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', BLOCKED_CONTENT_PREFS)
         
         self.driver = webdriver.Chrome(options=options)
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
         self.wait = WebDriverWait(self.driver, 10)
     
     def scrape_venue(self, event_id, venue_name, gender, limit=100):
@@ -77,7 +87,7 @@ class HyroxScraper:
                 )
                 
                 # Give extra time for all results to render
-                time.sleep(1)
+                time.sleep(0.5)
                 
                 # Extract results using JavaScript
                 results = self.driver.execute_script("""
@@ -157,39 +167,95 @@ class HyroxScraper:
             if venue_filter and venue_key not in venue_filter:
                 continue
             
-            venue_name = venue_info['name']
-            event_id = venue_info['event_id']
-            
-            print(f"\n📍 {venue_name}")
-            
-            # Scrape Men's results
-            men_results = self.scrape_venue(event_id, venue_name, 'M', limit)
-            if men_results:
-                all_results.append({
-                    'venue': venue_name,
-                    'gender': 'M',
-                    'results': men_results
-                })
-            
-            # Scrape Women's results
-            women_results = self.scrape_venue(event_id, venue_name, 'W', limit)
-            if women_results:
-                all_results.append({
-                    'venue': venue_name,
-                    'gender': 'W',
-                    'results': women_results
-                })
+            all_results.extend(self.scrape_venue_genders(venue_info, limit))
             
             # Be polite to the server
             time.sleep(1)
         
         return all_results
     
+    def scrape_venue_genders(self, venue_info, limit=100):
+        """
+        Scrape Men's and Women's results for a single venue.
+        
+        Args:
+            venue_info: Venue configuration with 'name' and 'event_id'
+            limit: Number of results per gender
+            
+        Returns:
+            list: One entry per gender that returned results
+        """
+        venue_name = venue_info['name']
+        event_id = venue_info['event_id']
+        
+        print(f"\n📍 {venue_name}")
+        
+        venue_results = []
+        
+        for gender in ('M', 'W'):
+            results = self.scrape_venue(event_id, venue_name, gender, limit)
+            if results:
+                venue_results.append({
+                    'venue': venue_name,
+                    'gender': gender,
+                    'results': results
+                })
+        
+        return venue_results
+    
     def close(self):
         """Close the WebDriver."""
         self.driver.quit()
 
 
+def scrape_all_venues_parallel(venues_config, venue_filter=None, limit=100,
+                               workers=4, headless=True):
+    """
+    Scrape venues concurrently, one WebDriver per worker thread.
+    
+    WebDriver instances are not thread-safe, so each worker lazily creates its
+    own HyroxScraper and reuses it for every venue it picks up.
+    
+    Args:
+        venues_config: Dictionary of venue configurations
+        venue_filter: Optional list of venue keys to scrape
+        limit: Number of results per gender per venue
+        workers: Number of concurrent browser instances
+        headless: Run browsers in headless mode
+        
+    Returns:
+        list: Combined results from all venues, in configuration order
+    """
+    selected = [
+        venue_info for venue_key, venue_info in venues_config.items()
+        if not venue_filter or venue_key in venue_filter
+    ]
+    
+    local = threading.local()
+    scrapers = []
+    scrapers_lock = threading.Lock()
+    
+    def scrape_one(venue_info):
+        scraper = getattr(local, 'scraper', None)
+        if scraper is None:
+            scraper = local.scraper = HyroxScraper(headless=headless)
+            with scrapers_lock:
+                scrapers.append(scraper)
+        return scraper.scrape_venue_genders(venue_info, limit)
+    
+    all_results = []
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for venue_results in pool.map(scrape_one, selected):
+                all_results.extend(venue_results)
+    finally:
+        for scraper in scrapers:
+            scraper.close()
+    
+    return all_results
+
+
 def load_venues_config():
     """Load venue configuration from venues.json."""
     config_file = Path(__file__).parent / 'venues.json'
@@ -207,6 +273,7 @@ def main():
     parser.add_argument('--venues', type=str, help='Comma-separated list of venue keys to scrape')
     parser.add_argument('--limit', type=int, default=100, help='Number of results per gender per venue')
     parser.add_argument('--headless', action='store_true', default=True, help='Run browser in headless mode')
+    parser.add_argument('--workers', type=int, default=1, help='Number of venues to scrape concurrently (one browser each)')
     
     args = parser.parse_args()
     
@@ -218,30 +285,32 @@ def main():
     if args.venues:
         venue_filter = [v.strip() for v in args.venues.split(',')]
     
-    # Initialize scraper
-    scraper = HyroxScraper(headless=args.headless)
+    print("🏃 HYROX Venue Data Scraper")
+    print("=" * 50)
     
-    try:
-        print("🏃 HYROX Venue Data Scraper")
-        print("=" * 50)
-        
-        # Scrape all venues
-        results = scraper.scrape_all_venues(venues_config, venue_filter, args.limit)
-        
-        # Save raw data
-        output_file = Path(__file__).parent.parent / '.tmp' / 'hyrox_scraped_raw.json'
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        print(f"\n✅ Scraping complete!")
-        print(f"   Total venues: {len(set(r['venue'] for r in results))}")
-        print(f"   Total results: {sum(len(r['results']) for r in results)}")
-        print(f"   Saved to: {output_file}")
-        
-    finally:
-        scraper.close()
+    if args.workers > 1:
+        results = scrape_all_venues_parallel(
+            venues_config, venue_filter, args.limit,
+            workers=args.workers, headless=args.headless
+        )
+    else:
+        scraper = HyroxScraper(headless=args.headless)
+        try:
+            results = scraper.scrape_all_venues(venues_config, venue_filter, args.limit)
+        finally:
+            scraper.close()
+    
+    # Save raw data (compact, gzip-compressed)
+    output_file = Path(__file__).parent.parent / '.tmp' / 'hyrox_scraped_raw.json.gz'
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    with gzip.open(output_file, 'wt', encoding='utf-8') as f:
+        json.dump(results, f, separators=(',', ':'))
+    
+    print(f"\n✅ Scraping complete!")
+    print(f"   Total venues: {len(set(r['venue'] for r in results))}")
+    print(f"   Total results: {sum(len(r['results']) for r in results)}")
+    print(f"   Saved to: {output_file}")
 
 
 if __name__ == '__main__':
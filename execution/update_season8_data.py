@@ -6,30 +6,47 @@ This script:
 1. Loads the Season 8 event list from `season_8_events.json`.
 2. Checks `data/scraping_state.json` to see which events are new or incomplete.
 3. Scrapes the Top 80% of Men's and Women's "HYROX Overall" results for each incomplete event.
-   - Calculates the 80% cutoff by first checking the total count.
+   - Calculates the 80% cutoff from the total count shown on the first page.
    - Saves raw data to `.tmp/raw_results`.
    - Updates the state file upon completion.
 
 Usage:
     python update_season8_data.py
+    python update_season8_data.py --no-cache  # Skip the .tmp/http_cache page cache
+    python update_season8_data.py --refresh "2025 Anaheim"  # Re-download one event
 """
 
+import hashlib
 import json
+import math
 import os
+import re
+import shutil
+import sqlite3
+import tempfile
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from urllib.parse import urlencode
-from datetime import datetime
+from urllib.parse import urlencode, urlsplit, parse_qs
+from datetime import datetime, timedelta
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from urllib3.util.retry import Retry
+
+from hyrox_common import RateLimiter
 
 # Configuration
 SEASON_8_FILE = Path(__file__).parent / 'season_8_events.json'
 STATE_FILE = Path('data/scraping_state.json')
 RAW_DATA_DIR = Path('.tmp/raw_results')
+DB_PATH = Path('data/hyrox_results.db')
+HTTP_CACHE_DIR = Path('.tmp/http_cache')
+HTTP_CACHE_TTL = timedelta(days=7)
 BASE_URL = 'https://results.hyrox.com'
 
 # Ensure directories exist
@@ -41,6 +58,34 @@ DIVISIONS = {
     'women': 'W',
 }
 
+RESULTS_PER_PAGE = 50  # 50 is typical max per page
+
+# Maximum network request rate across every worker (cached pages don't count)
+REQUESTS_PER_SECOND = 1
+
+# Result pages fetched concurrently per division
+PAGE_WORKERS = 2
+
+# Events scraped concurrently (each runs its own page pool); at most
+# EVENT_WORKERS * PAGE_WORKERS requests are ever in flight, all sharing the
+# one rate limiter above
+EVENT_WORKERS = 2
+
+# Shared HTTP session: keep-alive connections are reused across every count probe
+# and page of every event, and rate-limit/gateway errors are retried with backoff
+SESSION = requests.Session()
+SESSION.headers['User-Agent'] = 'Mozilla/5.0 (compatible; hyroxcoursecorrect/1.0)'
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=EVENT_WORKERS * PAGE_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+))
+
+# Disable with --no-cache to always hit the network
+USE_HTTP_CACHE = True
+
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+
 def load_json(filepath):
     if not filepath.exists():
         return {}
@@ -55,7 +100,7 @@ def build_url(event_config, gender, page=1):
     params = {
         'page': page,
         'event': event_config.get('id'),
-        'num_results': 50, # 50 is typical max per page
+        'num_results': RESULTS_PER_PAGE,
         'pid': 'list',
         'ranking': 'time_finish_netto',
         'search[sex]': gender,
@@ -70,100 +115,159 @@ def build_url(event_config, gender, page=1):
     base = f"{BASE_URL}/season-8/"
     return base + '?' + urlencode(params)
 
+def _cache_dir_for(event_group):
+    return HTTP_CACHE_DIR / event_group.replace(' ', '_').lower()
+
+def cache_path(url):
+    """On-disk cache location for a page, grouped by event so it can be refreshed."""
+    params = parse_qs(urlsplit(url).query)
+    group = (params.get('event_main_group') or params.get('event') or ['misc'])[0]
+    return _cache_dir_for(group) / f"{hashlib.sha1(url.encode()).hexdigest()}.html"
+
+def fetch_content(url):
+    """
+    GET a results page through the on-disk HTTP cache.
+    
+    Fresh cached pages are returned without touching the network or the rate
+    limiter; a stale copy is served if the request fails. Raises requests
+    exceptions on failure when nothing is cached.
+    """
+    path = cache_path(url)
+    cached = USE_HTTP_CACHE and path.exists()
+    if cached and time.time() - path.stat().st_mtime < HTTP_CACHE_TTL.total_seconds():
+        return path.read_bytes()
+    
+    _rate_limiter.wait()
+    try:
+        resp = SESSION.get(url, timeout=30)
+        resp.raise_for_status()
+    except requests.RequestException:
+        if cached:
+            return path.read_bytes()
+        raise
+    
+    if USE_HTTP_CACHE:
+        # Write-then-rename so concurrent page workers never see a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(resp.content)
+        os.replace(tmp_path, path)
+    return resp.content
+
+def clear_http_cache(event_group):
+    """Drop every cached page for one event group."""
+    shutil.rmtree(_cache_dir_for(event_group), ignore_errors=True)
+
 def parse_time(time_str):
+    """Convert H:MM:SS or MM:SS to seconds (None if unparseable)."""
     if not time_str: return None
+    time_str = time_str.strip()
+    # Locate the separators directly instead of building a list with split()
+    first = time_str.find(':')
+    if first < 0:
+        return None
+    second = time_str.find(':', first + 1)
     try:
-        parts = time_str.strip().split(':')
-        if len(parts) == 3:
-            return int(parts[0])*3600 + int(parts[1])*60 + int(parts[2])
-        elif len(parts) == 2:
-            return int(parts[0])*60 + int(parts[1])
-    except:
+        if second < 0:
+            return int(time_str[:first])*60 + int(time_str[first + 1:])
+        if time_str.find(':', second + 1) >= 0:
+            return None
+        return int(time_str[:first])*3600 + int(time_str[first + 1:second])*60 + int(time_str[second + 1:])
+    except ValueError:
         return None
-    return None
 
-def get_total_results(event_config, gender):
+def _class_xpath(tag, css_class):
+    """XPath for the text of the first descendant <tag> carrying the given class."""
+    return f"string((.//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')])[1])"
+
+# Compiled once at import instead of re-walking the tree with find() per row
+_RESULT_ROWS = etree.XPath("//li[contains(concat(' ', normalize-space(@class), ' '), ' list-active ')]")
+_PLACE = etree.XPath(_class_xpath('div', 'type-place'))
+_FULLNAME = etree.XPath(_class_xpath('h4', 'type-fullname'))
+_TIME = etree.XPath(_class_xpath('div', 'type-time'))
+_STR_NUM = etree.XPath(_class_xpath('span', 'str_num'))
+
+# Result-count patterns, compiled once at import
+_RE_COUNT = re.compile(r'(\d+)')
+_RE_ENTRIES = re.compile(r'Entries:\s*(\d+)')
+_RE_RESULTS_RANGE = re.compile(r'Results \d+-\d+ of (\d+)')
+_RE_RESULTS_COUNT = re.compile(r'(\d+) Results', re.IGNORECASE)
+
+def fetch_tree(url):
     """
-    Finds the total number of results by checking the last page.
-    This is tricky because we don't know the last page number.
-    We can try a binary search or just 'search' for the text on the page?
-    Actually, usually the text says "Results 1-50 of 1234".
+    Fetch and parse a results page.
+    
+    Returns None on failure; a 404 or blank page yields an empty document.
     """
-    import re
-    url = build_url(event_config, gender, page=1)
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.content, 'html.parser')
-        
-        # Look for the specific element class found by the subagent
-        total_elem = soup.find('span', class_='str_num')
-        if total_elem:
-            text = total_elem.get_text().strip()
-            # Text is "1835 Results" or similar
-            match = re.search(r'(\d+)', text)
-            if match:
-                return int(match.group(1))
-
-        # Look for "Results X-Y of Z"
-        # Often in a div or similar. Or just regex the body text.
-        import re
-        text = soup.get_text()
-        
-        # Try finding the "Entries: X" text which is common in Hyrox results
-        match = re.search(r'Entries:\s*(\d+)', text)
-        if match:
-            return int(match.group(1))
-            
-        match = re.search(r'Results \d+-\d+ of (\d+)', text)
-        if match:
-            return int(match.group(1))
-            
-        # Fallback: check pagination
-        # Or maybe it's "1234 results found"
-        match = re.search(r'(\d+) Results', text, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-            
-        # Check for list items count if small
-        results_count = len(soup.find_all('li', class_='list-active'))
-        if results_count > 0 and results_count < 50:
-            return results_count
-            
-        return 0
-    except Exception as e:
-        print(f"    Error getting count: {e}")
-        return 0
-
-def scrape_page(url, event_name, gender):
-    try:
-        resp = requests.get(url, timeout=30)
-        if resp.status_code == 404:
-            return []
-        resp.raise_for_status()
+        content = fetch_content(url)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return lxml.html.fromstring('<html></html>')
+        print(f"    Error fetching {url}: {e}")
+        return None
     except Exception as e:
         print(f"    Error fetching {url}: {e}")
-        return None  # None indicates failure, [] indicates empty page
+        return None
+
+    if not content.strip():
+        return lxml.html.fromstring('<html></html>')
+
+    return lxml.html.fromstring(content)
+
+def parse_total_results(tree):
+    """
+    Finds the total number of results for the division shown on a page.
+    Usually the text says "1835 Results" or "Results 1-50 of 1234".
+    """
+    # Look for the specific element class found by the subagent
+    # Text is "1835 Results" or similar
+    match = _RE_COUNT.search(_STR_NUM(tree))
+    if match:
+        return int(match.group(1))
+
+    # Look for "Results X-Y of Z"
+    # Often in a div or similar. Or just regex the body text.
+    text = tree.text_content()
+    
+    # Try finding the "Entries: X" text which is common in Hyrox results
+    match = _RE_ENTRIES.search(text)
+    if match:
+        return int(match.group(1))
+        
+    match = _RE_RESULTS_RANGE.search(text)
+    if match:
+        return int(match.group(1))
+        
+    # Fallback: check pagination
+    # Or maybe it's "1234 results found"
+    match = _RE_RESULTS_COUNT.search(text)
+    if match:
+        return int(match.group(1))
+        
+    # Check for list items count if small
+    results_count = len(_RESULT_ROWS(tree))
+    if results_count > 0 and results_count < RESULTS_PER_PAGE:
+        return results_count
+        
+    return 0
 
-    soup = BeautifulSoup(resp.content, 'html.parser')
-    rows = soup.find_all('li', class_='list-active')
+def parse_results(tree, event_name, gender):
     results = []
 
-    for row in rows:
+    for row in _RESULT_ROWS(tree):
         try:
             # Rank
-            rank_elem = row.find('div', class_='type-place')
             # Handle cases where rank is "DSQ" or "-"
-            rank_text = rank_elem.text.strip().replace('.', '') if rank_elem else None
-            rank = int(rank_text) if rank_text and rank_text.isdigit() else None
+            rank_text = _PLACE(row).strip().replace('.', '')
+            rank = int(rank_text) if rank_text.isdigit() else None
             
             # Name
-            name_elem = row.find('h4', class_='type-fullname')
-            name = name_elem.text.strip() if name_elem else None
+            name = _FULLNAME(row).strip() or None
             
             # Time
-            time_elem = row.find('div', class_='type-time')
-            time_str = time_elem.text.strip().replace('Total', '').strip() if time_elem else None
+            time_str = _TIME(row).strip().replace('Total', '').strip() or None
             seconds = parse_time(time_str)
             
             if name and seconds:
@@ -180,6 +284,12 @@ def scrape_page(url, event_name, gender):
             
     return results
 
+def scrape_page(url, event_name, gender):
+    tree = fetch_tree(url)
+    if tree is None:
+        return None  # None indicates failure, [] indicates empty page
+    return parse_results(tree, event_name, gender)
+
 def scrape_event(event_config, state):
     event_name = event_config['name']
     print(f"\nProcessing: {event_name}")
@@ -223,7 +333,9 @@ def scrape_single_id(event_config, event_name):
     """
     results = []
     for div_name, gender_code in DIVISIONS.items():
-        total_count = get_total_results(event_config, gender_code)
+        # Page 1 carries the total count, so it doubles as the count probe
+        first_page = fetch_tree(build_url(event_config, gender_code, page=1))
+        total_count = parse_total_results(first_page) if first_page is not None else 0
         
         if total_count == 0:
             print(f"    {div_name.capitalize()}: No results found (or failed to load). Skipping.")
@@ -232,109 +344,131 @@ def scrape_single_id(event_config, event_name):
         cutoff_rank = int(total_count * 0.8)
         print(f"    {div_name.capitalize()}: {total_count} total. Target (Top 80%): {cutoff_rank}")
         
-        page = 1
-        consecutive_failures = 0
+        # The total tells us exactly which pages hold the top 80%, so fetch them concurrently
+        num_pages = math.ceil(cutoff_rank / RESULTS_PER_PAGE)
+        urls = [build_url(event_config, gender_code, page) for page in range(2, num_pages + 1)]
         
-        while True:
-            url = build_url(event_config, gender_code, page)
-            page_results = scrape_page(url, event_name, gender_code)
-            
-            if page_results is None:
-                consecutive_failures += 1
-                if consecutive_failures >= 3:
-                    print(f"      Failed 3 times on page {page}. Moving to next division.")
-                    break
-                time.sleep(2)
-                continue
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+            pages = pool.map(lambda url: scrape_page(url, event_name, gender_code), urls)
+            first_results = parse_results(first_page, event_name, gender_code)
             
-            consecutive_failures = 0
-            
-            if not page_results:
-                break
+            for page, page_results in enumerate([first_results, *pages], 1):
+                # Transient errors were already retried by the session
+                if page_results is None:
+                    print(f"      Failed on page {page}. Skipping page.")
+                    continue
                 
-            filtered_page = [r for r in page_results if r['rank'] is not None and r['rank'] <= cutoff_rank]
-            
-            # If all results on this page are beyond cutoff, stop
-            if not filtered_page and page_results[0]['rank'] and page_results[0]['rank'] > cutoff_rank:
-                 print(f"      Reached cutoff ranking at page {page}.")
-                 break
-            
-            if filtered_page:
-                results.extend(filtered_page)
-            
-            # Check last item on page to see if we passed cutoff
-            last_rank = page_results[-1]['rank']
-            if last_rank and last_rank > cutoff_rank:
-                 break
-                 
-            page += 1
-            time.sleep(1) # Rate limit
+                results.extend(r for r in page_results if r['rank'] is not None and r['rank'] <= cutoff_rank)
     return results
 
-def update_database_for_event(event_name, results):
+# The venue is cleared first; ON CONFLICT only merges a key repeated within one batch
+INSERT_SQL = '''
+    INSERT INTO race_results (
+        venue, event_id, location, region, gender, rank, name, nationality, age_group, finish_time, finish_seconds
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(venue, gender, rank, name) DO UPDATE SET
+        event_id = excluded.event_id,
+        nationality = excluded.nationality,
+        age_group = excluded.age_group,
+        finish_time = excluded.finish_time,
+        finish_seconds = excluded.finish_seconds
+'''
+
+def open_db():
+    """Open one connection for the whole run, tuned for bulk writes."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+    """)
+    
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'race_results'"
+    ).fetchone()
+    if not has_table:
+        # Nothing to migrate; per-event writes report the missing table as before
+        print("  Warning: race_results table not found; skipping unique index migration.")
+        return conn
+    
+    with conn:
+        # Drop duplicates left by earlier runs so the unique index can be built
+        conn.execute('''
+            DELETE FROM race_results
+            WHERE id NOT IN (
+                SELECT MIN(id) FROM race_results
+                GROUP BY venue, gender, rank, name
+            )
+        ''')
+        conn.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_race_unique
+            ON race_results(venue, gender, rank, name)
+        ''')
+    return conn
+
+def update_database_for_event(conn, event_name, results):
     """
     Updates the SQLite database with the results from a single event.
-    """
-    db_path = Path('data/hyrox_results.db')
-    import sqlite3
     
+    The venue's previous rows are replaced, so athletes who dropped out of
+    the top 80% or changed rank leave no stale rows behind. The DELETE and
+    INSERTs run in one transaction, so a failure leaves the event's previous
+    rows untouched.
+    """
     if not results:
         return
 
     print(f"  > Updating Database for {event_name} ({len(results)} records)...")
+    
+    # Schema: venue, event_id, location, region, gender, rank, name, nationality, age_group, finish_time, finish_seconds
+    # Location/region are not in the results dict, so they are stored as 'Unknown'
+    rows = [(
+        event_name,
+        r.get('event_id', 'UNKNOWN'),
+        'Unknown',
+        'Unknown',
+        r['gender'],
+        r['rank'],
+        r['name'],
+        r.get('nationality', 'N/A'),
+        r.get('age_group', 'N/A'),
+        r['finish_time'],
+        r['finish_seconds']
+    ) for r in results]
+    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # We need to adhere to the schema: 
-        # venue, event_id, location, region, gender, rank, name, nationality, age_group, finish_time, finish_seconds
-        
-        # First, delete existing entries for this venue to avoid duplicates if we are re-scraping
-        cursor.execute("DELETE FROM race_results WHERE venue = ?", (event_name,))
-        
-        # Prepare data
-        rows = []
-        for r in results:
-            # Enrich/Clean data if needed
-            # We don't have location/region in the results dict, but we could pass it from event_config
-            # For now, we'll just insert what we have.
-            # Wait, the current schema expects specific columns.
-            # Let's check `web/utils/database.py` or existing schema.
-            # Schema: id, venue, event_id, location, region, gender, rank, name, nationality, age_group, finish_time, finish_seconds
-            
-            rows.append((
-                event_name,
-                r.get('event_id', 'UNKNOWN'), # We might need to pass this down
-                'Unknown', # Location
-                'Unknown', # Region
-                r['gender'],
-                r['rank'],
-                r['name'],
-                r.get('nationality', 'N/A'),
-                r.get('age_group', 'N/A'),
-                r['finish_time'],
-                r['finish_seconds']
-            ))
-            
-        cursor.executemany('''
-            INSERT INTO race_results (
-                venue, event_id, location, region, gender, rank, name, nationality, age_group, finish_time, finish_seconds
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', rows)
-        
-        conn.commit()
-        conn.close()
+        with conn:
+            # Delete existing entries for this venue to avoid duplicates if we are re-scraping
+            conn.execute("DELETE FROM race_results WHERE venue = ?", (event_name,))
+            conn.executemany(INSERT_SQL, rows)
         print(f"  > Database Updated.")
         
     except Exception as e:
         print(f"  Error updating database: {e}")
 
 def main():
+    global USE_HTTP_CACHE
+    
+    parser = argparse.ArgumentParser(description='Update Season 8 HYROX results')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the on-disk HTTP cache (always fetch fresh pages)')
+    parser.add_argument('--refresh', nargs='+', metavar='EVENT', default=[],
+                        help='Drop cached pages for these event names before scraping')
+    args = parser.parse_args()
+    
+    USE_HTTP_CACHE = not args.no_cache
+    
     if not SEASON_8_FILE.exists():
         print(f"Error: {SEASON_8_FILE} not found.")
         return
 
     season_events = load_json(SEASON_8_FILE)
+    
+    for event_config in season_events:
+        if event_config['name'] in args.refresh:
+            clear_http_cache(event_config.get('event_group', event_config['name']))
+            print(f"Cleared HTTP cache for {event_config['name']}")
+    
     state = load_json(STATE_FILE)
     
     if 'completed_events' not in state:
@@ -342,35 +476,57 @@ def main():
         
     print(f"Found {len(season_events)} events in Season 8 list.")
     
+    conn = open_db()
+    try:
+        scrape_pending_events(conn, season_events, state)
+    finally:
+        conn.close()
+
+def scrape_pending_events(conn, season_events, state):
+    """
+    Scrape every event not yet completed, saving raw files and DB rows as we go.
+    
+    Events are scraped concurrently; results are persisted from this thread
+    as each event finishes, so DB and state-file writes never overlap.
+    """
+    pending = []
     for event_config in season_events:
-        event_name = event_config['name']
-        
-        if event_name in state['completed_events']:
-            print(f"Skipping {event_name} (Already Completed)")
-            continue
-            
-        # Scrape
-        results = scrape_event(event_config, state)
+        if event_config['name'] in state['completed_events']:
+            print(f"Skipping {event_config['name']} (Already Completed)")
+        else:
+            pending.append(event_config)
+    
+    with ThreadPoolExecutor(max_workers=EVENT_WORKERS) as pool:
+        futures = {pool.submit(scrape_event, event_config, state): event_config for event_config in pending}
         
-        if results:
-            # Save raw files
-            safe_name = event_name.replace(' ', '_').lower()
-            outfile = RAW_DATA_DIR / f"{safe_name}_raw.json"
+        for future in as_completed(futures):
+            event_name = futures[future]['name']
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"  Error scraping {event_name}: {e}")
+                continue
             
-            with open(outfile, 'w') as f:
-                json.dump(results, f, indent=2)
+            if results:
+                # Save raw files
+                safe_name = event_name.replace(' ', '_').lower()
+                outfile = RAW_DATA_DIR / f"{safe_name}_raw.json"
                 
-            print(f"  Saved {len(results)} results to {outfile}")
-            
-            # Update Database IMMEDIATELY
-            update_database_for_event(event_name, results)
-            
-            # Mark complete
-            state['completed_events'].append(event_name)
-            state['last_updated'] = datetime.now().isoformat()
-            save_json(STATE_FILE, state)
-        else:
-            print(f"  No results saved for {event_name}.")
+                # Compact separators: raw dumps are machine-read, so skip pretty-printing
+                with open(outfile, 'w') as f:
+                    json.dump(results, f, separators=(',', ':'))
+                    
+                print(f"  Saved {len(results)} results to {outfile}")
+                
+                # Update Database IMMEDIATELY
+                update_database_for_event(conn, event_name, results)
+                
+                # Mark complete
+                state['completed_events'].append(event_name)
+                state['last_updated'] = datetime.now().isoformat()
+                save_json(STATE_FILE, state)
+            else:
+                print(f"  No results saved for {event_name}.")
 
 if __name__ == '__main__':
     main()
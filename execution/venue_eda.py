@@ -9,6 +9,7 @@ Usage:
 """
 
 import argparse
+import os
 from pathlib import Path
 from typing import Dict, Any
 
@@ -21,11 +22,23 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Output resolution for saved plots (150 is plenty for on-screen EDA)
+PLOT_DPI = int(os.getenv('EDA_DPI', '150'))
+
 # Set plotting style
 sns.set_style('whitegrid')
 plt.rcParams['figure.figsize'] = (12, 8)
 plt.rcParams['font.size'] = 10
 
+# Columns the analysis reads, with compact dtypes (categorical venue makes every
+# groupby('venue') hash small integer codes instead of strings)
+EDA_DTYPES = {
+    'venue': 'category',
+    'athlete_id': 'string',
+    'finish_time_seconds': 'float64',
+    'event_date': 'string',
+}
+
 
 def calculate_venue_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -36,18 +49,15 @@ def calculate_venue_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
     print("Calculating venue statistics...")
     
-    stats = df.groupby('venue')['finish_time_seconds'].agg([
-        ('count', 'count'),
-        ('mean', 'mean'),
-        ('median', 'median'),
-        ('std', 'std'),
-        ('min', 'min'),
-        ('max', 'max'),
-        ('p10', lambda x: x.quantile(0.10)),
-        ('p25', lambda x: x.quantile(0.25)),
-        ('p75', lambda x: x.quantile(0.75)),
-        ('p90', lambda x: x.quantile(0.90)),
-    ]).round(2)
+    times = df.groupby('venue', observed=True)['finish_time_seconds']
+    
+    # Built-in aggregations plus all percentiles in one quantile pass per group
+    # (lambda quantiles would fall back to a Python call per group per percentile)
+    moments = times.agg(['count', 'mean', 'median', 'std', 'min', 'max'])
+    percentiles = times.quantile([0.10, 0.25, 0.75, 0.90]).unstack()
+    percentiles.columns = ['p10', 'p25', 'p75', 'p90']
+    
+    stats = pd.concat([moments, percentiles], axis=1).round(2)
     
     stats = stats.sort_values('mean')
     
@@ -75,24 +85,18 @@ def analyze_repeat_athletes(df: pd.DataFrame) -> pd.DataFrame:
     if len(repeat_athletes) == 0:
         return pd.DataFrame()
     
-    # For repeat athletes, calculate variance across venues
-    repeat_data = []
-    
-    for athlete_id in repeat_athletes.index:
-        athlete_results = df[df['athlete_id'] == athlete_id]
-        
-        repeat_data.append({
-            'athlete_id': athlete_id,
-            'num_venues': len(athlete_results['venue'].unique()),
-            'mean_time': athlete_results['finish_time_seconds'].mean(),
-            'std_time': athlete_results['finish_time_seconds'].std(),
-            'min_time': athlete_results['finish_time_seconds'].min(),
-            'max_time': athlete_results['finish_time_seconds'].max(),
-            'time_range': athlete_results['finish_time_seconds'].max() - 
-                         athlete_results['finish_time_seconds'].min(),
-        })
-    
-    repeat_df = pd.DataFrame(repeat_data)
+    # For repeat athletes, calculate variance across venues (one groupby pass
+    # over their rows rather than a boolean mask per athlete)
+    repeat_rows = df[df['athlete_id'].isin(repeat_athletes.index)]
+    repeat_df = repeat_rows.groupby('athlete_id')['finish_time_seconds'].agg(
+        mean_time='mean',
+        std_time='std',
+        min_time='min',
+        max_time='max',
+    )
+    repeat_df.insert(0, 'num_venues', repeat_athletes)
+    repeat_df['time_range'] = repeat_df['max_time'] - repeat_df['min_time']
+    repeat_df = repeat_df.reset_index()
     
     print(f"  Mean time variance across venues: {repeat_df['std_time'].mean():.1f} seconds")
     print(f"  Mean time range (max-min): {repeat_df['time_range'].mean():.1f} seconds")
@@ -100,94 +104,96 @@ def analyze_repeat_athletes(df: pd.DataFrame) -> pd.DataFrame:
     return repeat_df
 
 
-def plot_venue_distributions(df: pd.DataFrame, output_dir: Path, min_sample_size: int = 20):
-    """Create box plot of finish times by venue."""
-    print("\nGenerating venue distribution plot...")
-    
-    # Filter venues with sufficient sample size
-    venue_counts = df['venue'].value_counts()
-    valid_venues = venue_counts[venue_counts >= min_sample_size].index
-    plot_df = df[df['venue'].isin(valid_venues)]
-    
-    # Sort venues by median time
-    venue_order = plot_df.groupby('venue')['finish_time_seconds'].median().sort_values().index
+def new_axes(fig, figsize, ncols: int = 1):
+    """Clear the shared figure, resize it and return fresh axes for the next plot."""
+    fig.clear()
+    fig.set_size_inches(*figsize)
+    return fig.subplots(1, ncols)
+
+
+def save_figure(fig, output_file: Path):
+    """Write the shared figure to disk (the figure itself is reused)."""
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=PLOT_DPI, bbox_inches='tight')
+    print(f"  Saved: {output_file}")
+
+
+def plot_venue_distributions(stats: pd.DataFrame, ax, min_sample_size: int = 20):
+    """
+    Create box plot of finish times by venue.
     
-    plt.figure(figsize=(14, 8))
-    sns.boxplot(data=plot_df, x='venue', y='finish_time_seconds', order=venue_order)
-    plt.xticks(rotation=45, ha='right')
-    plt.xlabel('Venue')
-    plt.ylabel('Finish Time (seconds)')
-    plt.title(f'HYROX Finish Time Distribution by Venue (n≥{min_sample_size})')
-    plt.tight_layout()
+    Boxes are drawn from the quantiles already in ``stats`` (whiskers at
+    P10/P90) rather than recomputed from every row, and outliers are not
+    drawn individually.
+    """
+    print("\nGenerating venue distribution plot...")
     
-    output_file = output_dir / 'venue_time_distributions.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.close()
+    # Filter venues with sufficient sample size, sorted by median time
+    plot_stats = stats[stats['count'] >= min_sample_size].sort_values('median')
+    
+    box_stats = [
+        {
+            'label': venue,
+            'med': row['median'],
+            'q1': row['p25'],
+            'q3': row['p75'],
+            'whislo': row['p10'],
+            'whishi': row['p90'],
+            'fliers': [],
+        }
+        for venue, row in plot_stats.iterrows()
+    ]
     
-    print(f"  Saved: {output_file}")
+    ax.bxp(box_stats, showfliers=False)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.set_xlabel('Venue')
+    ax.set_ylabel('Finish Time (seconds)')
+    ax.set_title(f'HYROX Finish Time Distribution by Venue (n≥{min_sample_size}, whiskers P10–P90)')
 
 
-def plot_venue_comparison_heatmap(stats: pd.DataFrame, output_dir: Path):
+def plot_venue_comparison_heatmap(stats: pd.DataFrame, ax):
     """Create heatmap comparing venue statistics."""
     print("Generating venue comparison heatmap...")
     
     # Select key metrics for heatmap
     heatmap_data = stats[['mean', 'median', 'std', 'count']].T
     
-    # Normalize for better visualization
-    heatmap_normalized = (heatmap_data - heatmap_data.min(axis=1).values.reshape(-1, 1)) / \
-                        (heatmap_data.max(axis=1) - heatmap_data.min(axis=1)).values.reshape(-1, 1)
+    # Min-max normalize each metric row (constant rows map to 0 instead of NaN)
+    values = heatmap_data.to_numpy(dtype=float)
+    mins = values.min(axis=1, keepdims=True)
+    spans = values.max(axis=1, keepdims=True) - mins
+    heatmap_normalized = pd.DataFrame(
+        (values - mins) / np.where(spans == 0, 1, spans),
+        index=heatmap_data.index,
+        columns=heatmap_data.columns,
+    )
     
-    plt.figure(figsize=(16, 6))
     sns.heatmap(heatmap_normalized, annot=heatmap_data.round(0), fmt='g', 
-                cmap='RdYlGn_r', cbar_kws={'label': 'Normalized Value'})
-    plt.xlabel('Venue')
-    plt.ylabel('Metric')
-    plt.title('HYROX Venue Comparison Heatmap')
-    plt.tight_layout()
-    
-    output_file = output_dir / 'venue_comparison_heatmap.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"  Saved: {output_file}")
+                cmap='RdYlGn_r', cbar_kws={'label': 'Normalized Value'}, ax=ax)
+    ax.set_xlabel('Venue')
+    ax.set_ylabel('Metric')
+    ax.set_title('HYROX Venue Comparison Heatmap')
 
 
-def plot_sample_sizes(stats: pd.DataFrame, output_dir: Path):
+def plot_sample_sizes(stats: pd.DataFrame, ax):
     """Create bar chart of sample sizes per venue."""
     print("Generating sample size plot...")
     
-    plt.figure(figsize=(14, 6))
     stats_sorted = stats.sort_values('count', ascending=False)
-    plt.bar(range(len(stats_sorted)), stats_sorted['count'])
-    plt.xticks(range(len(stats_sorted)), stats_sorted.index, rotation=45, ha='right')
-    plt.xlabel('Venue')
-    plt.ylabel('Number of Athletes')
-    plt.title('Sample Size by Venue')
-    plt.axhline(y=20, color='r', linestyle='--', label='Minimum threshold (20)')
-    plt.legend()
-    plt.tight_layout()
-    
-    output_file = output_dir / 'venue_sample_sizes.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"  Saved: {output_file}")
+    ax.bar(range(len(stats_sorted)), stats_sorted['count'])
+    ax.set_xticks(range(len(stats_sorted)))
+    ax.set_xticklabels(stats_sorted.index, rotation=45, ha='right')
+    ax.set_xlabel('Venue')
+    ax.set_ylabel('Number of Athletes')
+    ax.set_title('Sample Size by Venue')
+    ax.axhline(y=20, color='r', linestyle='--', label='Minimum threshold (20)')
+    ax.legend()
 
 
-def plot_repeat_athlete_variance(df: pd.DataFrame, repeat_df: pd.DataFrame, output_dir: Path):
+def plot_repeat_athlete_variance(repeat_df: pd.DataFrame, axes):
     """Plot variance in repeat athlete performance across venues."""
     print("Generating repeat athlete variance plot...")
     
-    if len(repeat_df) == 0:
-        print("  Skipped: No repeat athletes found")
-        return
-    
-    # Get top 20 repeat athletes by number of venues
-    top_athletes = repeat_df.nlargest(20, 'num_venues')
-    
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-    
     # Plot 1: Time range distribution
     axes[0].hist(repeat_df['time_range'], bins=30, edgecolor='black')
     axes[0].set_xlabel('Time Range (max - min, seconds)')
@@ -199,14 +205,6 @@ def plot_repeat_athlete_variance(df: pd.DataFrame, repeat_df: pd.DataFrame, outp
     axes[1].set_xlabel('Mean Finish Time (seconds)')
     axes[1].set_ylabel('Std Dev Across Venues (seconds)')
     axes[1].set_title('Athlete Ability vs Venue Sensitivity')
-    
-    plt.tight_layout()
-    
-    output_file = output_dir / 'repeat_athlete_variance.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    print(f"  Saved: {output_file}")
 
 
 def generate_report(df: pd.DataFrame, stats: pd.DataFrame, repeat_df: pd.DataFrame, 
@@ -284,7 +282,7 @@ def main():
         return
     
     print(f"Loading data from {args.input}...")
-    df = pd.read_csv(args.input)
+    df = pd.read_csv(args.input, usecols=lambda col: col in EDA_DTYPES, dtype=EDA_DTYPES)
     print(f"  Loaded {len(df)} records")
     
     # Calculate statistics
@@ -297,10 +295,26 @@ def main():
         repeat_df.to_csv(args.output_dir.parent / 'repeat_athlete_analysis.csv', index=False)
     
     # Generate visualizations
-    plot_venue_distributions(df, args.output_dir, args.min_sample_size)
-    plot_venue_comparison_heatmap(stats, args.output_dir)
-    plot_sample_sizes(stats, args.output_dir)
-    plot_repeat_athlete_variance(df, repeat_df, args.output_dir)
+    # One figure is cleared and reused for every plot
+    fig = plt.figure()
+    try:
+        plot_venue_distributions(stats, new_axes(fig, (14, 8)), args.min_sample_size)
+        save_figure(fig, args.output_dir / 'venue_time_distributions.png')
+        
+        plot_venue_comparison_heatmap(stats, new_axes(fig, (16, 6)))
+        save_figure(fig, args.output_dir / 'venue_comparison_heatmap.png')
+        
+        plot_sample_sizes(stats, new_axes(fig, (14, 6)))
+        save_figure(fig, args.output_dir / 'venue_sample_sizes.png')
+        
+        if len(repeat_df) > 0:
+            plot_repeat_athlete_variance(repeat_df, new_axes(fig, (16, 6), ncols=2))
+            save_figure(fig, args.output_dir / 'repeat_athlete_variance.png')
+        else:
+            print("Generating repeat athlete variance plot...")
+            print("  Skipped: No repeat athletes found")
+    finally:
+        plt.close(fig)
     
     # Generate report
     generate_report(df, stats, repeat_df, args.output_dir)
@@ -1,22 +1,34 @@
+import numpy as np
 import pandas as pd
 import statistics
 
+
+def upper_median(times):
+    """Middle element of the sorted times (upper middle for even counts), in O(n)."""
+    mid = len(times) // 2
+    return np.partition(times, mid)[mid]
+
+
 # Load the data
 df = pd.read_csv('data/hyrox_9venues_100each.csv')
 
 # Calculate median times for each venue by gender
 results = {}
 
+# One pass into per-(venue, gender) time arrays instead of masking per venue
+times_by_venue_gender = {
+    key: times.to_numpy()
+    for key, times in df.groupby(['venue', 'gender'], sort=False)['finish_seconds']
+}
+
 for venue in df['venue'].unique():
-    venue_df = df[df['venue'] == venue]
-    
     # Get median times
-    men_times = venue_df[venue_df['gender'] == 'M']['finish_seconds'].tolist()
-    women_times = venue_df[venue_df['gender'] == 'W']['finish_seconds'].tolist()
+    men_times = times_by_venue_gender.get((venue, 'M'))
+    women_times = times_by_venue_gender.get((venue, 'W'))
     
-    if men_times and women_times:
-        men_median = sorted(men_times)[len(men_times) // 2]
-        women_median = sorted(women_times)[len(women_times) // 2]
+    if men_times is not None and women_times is not None:
+        men_median = upper_median(men_times)
+        women_median = upper_median(women_times)
         
         results[venue] = {
             'men_median': men_median,
@@ -1,4 +1,6 @@
 
+import io
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -7,78 +9,96 @@ from pathlib import Path
 DATA_FILE = Path('research/data/full_leaderboards.csv')
 OUTPUT_MD = Path('research/sampling_strategy_recommendation.md')
 
+# Only the columns the simulation uses; group keys as categories
+LEADERBOARD_DTYPES = {
+    'venue': 'category',
+    'gender': 'category',
+    'finish_seconds': 'float64',
+}
+
 def load_data():
     if not DATA_FILE.exists():
         print(f"File not found: {DATA_FILE}")
         return None
-    return pd.read_csv(DATA_FILE)
+    return pd.read_csv(DATA_FILE, usecols=lambda col: col in LEADERBOARD_DTYPES, dtype=LEADERBOARD_DTYPES)
 
 def calculate_medians(df):
     """Calculate true medians for each group."""
-    return df.groupby(['venue', 'gender'])['finish_seconds'].median()
+    return df.groupby(['venue', 'gender'], observed=True)['finish_seconds'].median()
 
-def simulate_sampling(df, true_medians):
-    results = []
-    
-    strategies = [
-        ('Top 50', lambda d: d.nsmallest(50, 'finish_seconds')),
-        ('Top 100', lambda d: d.nsmallest(100, 'finish_seconds')),
-        ('Top 200', lambda d: d.nsmallest(200, 'finish_seconds')),
-        ('Top 500', lambda d: d.nsmallest(500, 'finish_seconds')),
-        ('Top 10%', lambda d: d.nsmallest(int(len(d)*0.1), 'finish_seconds')),
-        ('Top 25%', lambda d: d.nsmallest(int(len(d)*0.25), 'finish_seconds')),
-        ('Top 50%', lambda d: d.nsmallest(int(len(d)*0.5), 'finish_seconds')),
-        ('Top 80%', lambda d: d.nsmallest(int(len(d)*0.8), 'finish_seconds')),
-        ('Every 5th', lambda d: d.iloc[::5]),
-        ('Every 10th', lambda d: d.iloc[::10]),
-        ('Every 20th', lambda d: d.iloc[::20]),
-        ('Every 50th', lambda d: d.iloc[::50]),
-        ('Every 100th', lambda d: d.iloc[::100]),
-    ]
-    
-    # Simulate Page Sampling (Assuming 50 results per page)
-    # We create a new valid sample by taking groups of 50
-    def get_every_kth_page(df, k):
-        chunks = [df.iloc[i:i+50] for i in range(0, len(df), 50)]
-        sampled_chunks = chunks[::k]
-        if not sampled_chunks: return pd.DataFrame()
-        return pd.concat(sampled_chunks)
+# Results per leaderboard page (for page-sampling strategies)
+PAGE_SIZE = 50
 
-    page_strategies = [
-        ('Every 2nd Page', lambda d: get_every_kth_page(d, 2)),
-        ('Every 5th Page', lambda d: get_every_kth_page(d, 5)),
-        ('Every 10th Page', lambda d: get_every_kth_page(d, 10)),
-    ]
-    
-    strategies.extend(page_strategies)
+# Each strategy selects rows by (position in the time-sorted group, group size)
+STRATEGIES = [
+    ('Top 50', lambda r, n: r < 50),
+    ('Top 100', lambda r, n: r < 100),
+    ('Top 200', lambda r, n: r < 200),
+    ('Top 500', lambda r, n: r < 500),
+    ('Top 10%', lambda r, n: r < (n * 0.1).astype(int)),
+    ('Top 25%', lambda r, n: r < (n * 0.25).astype(int)),
+    ('Top 50%', lambda r, n: r < (n * 0.5).astype(int)),
+    ('Top 80%', lambda r, n: r < (n * 0.8).astype(int)),
+    ('Every 5th', lambda r, n: r % 5 == 0),
+    ('Every 10th', lambda r, n: r % 10 == 0),
+    ('Every 20th', lambda r, n: r % 20 == 0),
+    ('Every 50th', lambda r, n: r % 50 == 0),
+    ('Every 100th', lambda r, n: r % 100 == 0),
+    # Simulate Page Sampling: keep every kth block of PAGE_SIZE results
+    ('Every 2nd Page', lambda r, n: (r // PAGE_SIZE) % 2 == 0),
+    ('Every 5th Page', lambda r, n: (r // PAGE_SIZE) % 5 == 0),
+    ('Every 10th Page', lambda r, n: (r // PAGE_SIZE) % 10 == 0),
+]
 
-    for (venue, gender), group in df.groupby(['venue', 'gender']):
-        group = group.sort_values('finish_seconds').reset_index(drop=True)
-        true_median = true_medians.loc[(venue, gender)]
-        n_total = len(group)
-        
-        for name, strategy_func in strategies:
-            sample = strategy_func(group)
-            if len(sample) == 0:
-                continue
-                
-            sample_median = sample['finish_seconds'].median()
-            abs_error = abs(sample_median - true_median)
-            pct_error = (abs_error / true_median) * 100
-            
-            results.append({
-                'venue': venue,
-                'gender': gender,
-                'total_athletes': n_total,
-                'strategy': name,
-                'sample_size': len(sample),
-                'true_median': true_median,
-                'sample_median': sample_median,
-                'abs_error_seconds': abs_error,
-                'pct_error': pct_error
-            })
-            
-    return pd.DataFrame(results)
+def simulate_sampling(df, true_medians):
+    """
+    Median error of every sampling strategy for every (venue, gender) group.
+    
+    The frame is sorted once into plain numpy arrays; each strategy is a
+    vectorized mask over the per-group row position. Masking keeps each sample
+    in time order, so every sample median is read positionally.
+    """
+    keys = ['venue', 'gender']
+    ranked = df.sort_values(keys + ['finish_seconds'], kind='stable')
+    # Already in key order after the sort, so the groupby need not re-sort keys
+    groups = ranked.groupby(keys, observed=True, sort=False)
+    group_ids = groups.ngroup().to_numpy()
+    r = groups.cumcount().to_numpy()
+    n = groups['finish_seconds'].transform('size').to_numpy()
+    values = ranked['finish_seconds'].to_numpy()
+    
+    sample_groups, sample_strategies, sample_sizes, sample_medians = [], [], [], []
+    for strategy_idx, (name, mask) in enumerate(STRATEGIES):
+        selected = mask(r, n)
+        sample = values[selected]
+        sample_group_ids = group_ids[selected]
+        # Each group's sample is one contiguous, already-sorted run
+        starts = np.flatnonzero(np.diff(sample_group_ids, prepend=-1))
+        sizes = np.diff(np.append(starts, len(sample)))
+        sample_groups.append(sample_group_ids[starts])
+        sample_strategies.append(np.full(len(starts), strategy_idx))
+        sample_sizes.append(sizes)
+        sample_medians.append((sample[starts + (sizes - 1) // 2] + sample[starts + sizes // 2]) / 2)
+    
+    sample_groups = np.concatenate(sample_groups)
+    sample_strategies = np.concatenate(sample_strategies)
+    order = np.lexsort((sample_strategies, sample_groups))
+    
+    group_keys = groups.size().index.to_frame(index=False)
+    results = group_keys.iloc[sample_groups[order]].reset_index(drop=True)
+    results['strategy'] = np.array([name for name, _ in STRATEGIES], dtype=object)[sample_strategies[order]]
+    results['sample_size'] = np.concatenate(sample_sizes)[order]
+    results['sample_median'] = np.concatenate(sample_medians)[order]
+    
+    totals = df.groupby(keys, observed=True).size().rename('total_athletes')
+    results = results.join(totals, on=keys).join(true_medians.rename('true_median'), on=keys)
+    results['abs_error_seconds'] = (results['sample_median'] - results['true_median']).abs()
+    results['pct_error'] = results['abs_error_seconds'] / results['true_median'] * 100
+    
+    return results[[
+        'venue', 'gender', 'total_athletes', 'strategy', 'sample_size',
+        'true_median', 'sample_median', 'abs_error_seconds', 'pct_error'
+    ]]
 
 def generate_report(results_df):
     summary = results_df.groupby('strategy').agg({
@@ -90,50 +110,53 @@ def generate_report(results_df):
     summary.columns = ['Mean Err (s)', 'Max Err (s)', 'Mean % Err', 'Max % Err', 'Avg Sample Size']
     summary = summary.sort_values('Mean % Err')
     
-    markdown = "# HYROX Sampling Strategy Research\n\n"
-    markdown += "## Objective\nTo determine the optimal scraping strategy (sample size/method) for calculating reliable course correction factors.\n\n"
-    markdown += "## Methodology\n"
-    markdown += "- **Datasets**: Full leaderboards for Anaheim 2025 and Maastricht 2025 (Men & Women Open).\n"
-    markdown += "- **Ground Truth**: Median finish time of the full population.\n"
-    markdown += "- **Metric**: Deviation from the true median (Absolute Seconds and Percentage).\n\n"
+    buf = io.StringIO()
+    w = buf.write
+    w("# HYROX Sampling Strategy Research\n\n")
+    w("## Objective\nTo determine the optimal scraping strategy (sample size/method) for calculating reliable course correction factors.\n\n")
+    w("## Methodology\n")
+    w("- **Datasets**: Full leaderboards for Anaheim 2025 and Maastricht 2025 (Men & Women Open).\n")
+    w("- **Ground Truth**: Median finish time of the full population.\n")
+    w("- **Metric**: Deviation from the true median (Absolute Seconds and Percentage).\n\n")
     
     
-    markdown += "## Results Summary\n\n"
+    w("## Results Summary\n\n")
     # Manual markdown table to avoid tabulate dependency
-    markdown += "| Strategy | " + " | ".join(summary.columns) + " |\n"
-    markdown += "|---|" + "|".join(["---"] * len(summary.columns)) + "|\n"
-    for idx, row in summary.iterrows():
-        markdown += f"| {idx} | " + " | ".join(map(str, row.values)) + " |\n"
-    markdown += "\n"
+    w("| Strategy | " + " | ".join(summary.columns) + " |\n")
+    w("|---|" + "|".join(["---"] * len(summary.columns)) + "|\n")
+    w("".join(
+        f"| {idx} | " + " | ".join(map(str, row)) + " |\n"
+        for idx, row in zip(summary.index, summary.itertuples(index=False))
+    ))
+    w("\n")
     
-    markdown += "## Detailed Analysis\n\n"
+    w("## Detailed Analysis\n\n")
     
     # Top N Analysis
-    markdown += "### Top N vs Full Population\n"
+    w("### Top N vs Full Population\n")
     top_n_stats = results_df[results_df['strategy'].str.startswith('Top')].sort_values('pct_error')
-    markdown += "Using only 'Top N' results (e.g., Top 100) consistently underestimates the median time (making the course look 'faster' than it is for the average athlete). "
-    markdown += "This is because the distribution is right-skewed; the elite are much faster than the average.\n\n"
+    w("Using only 'Top N' results (e.g., Top 100) consistently underestimates the median time (making the course look 'faster' than it is for the average athlete). ")
+    w("This is because the distribution is right-skewed; the elite are much faster than the average.\n\n")
     
     # Systematic Analysis
-    markdown += "### Systematic Sampling (Every Nth)\n"
+    w("### Systematic Sampling (Every Nth)\n")
     sys_stats = results_df[results_df['strategy'].str.startswith('Every')].sort_values('pct_error')
-    markdown += "Systematic sampling (taking every Nth result) preserves the distribution shape and provides a much more accurate estimate of the median with fewer requests.\n\n"
+    w("Systematic sampling (taking every Nth result) preserves the distribution shape and provides a much more accurate estimate of the median with fewer requests.\n\n")
     
     # Recommendation
     best_strategy = summary[summary['Max % Err'] < 1.0].iloc[0].name
     
-    markdown += "## Recommendation\n\n"
-    markdown += f"**Recommended Strategy: {best_strategy}**\n\n"
-    markdown += f"Based on the analysis, **{best_strategy}** provides a reliable estimate with minimal error "
-    markdown += "(typically < 1%). This balances data accuracy with scraping load.\n"
+    w("## Recommendation\n\n")
+    w(f"**Recommended Strategy: {best_strategy}**\n\n")
+    w(f"Based on the analysis, **{best_strategy}** provides a reliable estimate with minimal error ")
+    w("(typically < 1%). This balances data accuracy with scraping load.\n")
     
     if "Every" in best_strategy:
-        markdown += "- **Why?** It captures the full range of athlete abilities without needing to process every single row.\n"
-        markdown += "- **Implementation**: Scrape every page, but only store/process every Nth row? OR (better) scrape every Nth page if results are sorted by time (which is default).\n"
-        markdown += "  - *Note*: If we can jump pages, we save requests. If not, we still download everything but calculate faster.\n"
+        w("- **Why?** It captures the full range of athlete abilities without needing to process every single row.\n")
+        w("- **Implementation**: Scrape every page, but only store/process every Nth row? OR (better) scrape every Nth page if results are sorted by time (which is default).\n")
+        w("  - *Note*: If we can jump pages, we save requests. If not, we still download everything but calculate faster.\n")
     
-    with open(OUTPUT_MD, 'w') as f:
-        f.write(markdown)
+    OUTPUT_MD.write_text(buf.getvalue())
     
     print(f"Report generated: {OUTPUT_MD}")
     print(summary)
@@ -4,24 +4,50 @@ Research Scraper: Full Leaderboards for Sampling Analysis.
 
 Targets specific events (Anaheim 2025, Maastricht 2025) to scrape
 complete leaderboards (Men/Women Open) for determining optimal sample sizes.
+
+Usage:
+    python research/scrape_research_data.py
+    python research/scrape_research_data.py --sample-pages 5 --seed 1  # Random page sample
 """
 
 import argparse
 import csv
+import functools
+import hashlib
 import json
+import math
 import os
+import random
+import re
+import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urlencode
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from urllib3.util.retry import Retry
+
+# Shared scraper helpers live in execution/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'execution'))
+from hyrox_common import RateLimiter
 
 BASE_URL = 'https://results.hyrox.com'
 DATA_DIR = Path('research/data')
 OUTPUT_FILE = DATA_DIR / 'full_leaderboards.csv'
+# --sample-pages output (kept apart so the full leaderboards stay ground truth)
+SAMPLED_OUTPUT_FILE = DATA_DIR / 'sampled_leaderboards.csv'
+
+# Raw pages are cached on disk so re-runs while iterating on parsing are offline
+HTTP_CACHE_DIR = Path('.tmp/http_cache/research')
+HTTP_CACHE_TTL = timedelta(days=7)
+USE_HTTP_CACHE = True
 
 # Specific events for this research
 RESEARCH_EVENTS = {
@@ -42,6 +68,40 @@ DIVISIONS = {
     'women': 'W',
 }
 
+RESULTS_PER_PAGE = 100
+MAX_PAGES = 150
+
+# Concurrency: pages in flight at once, and the overall request rate cap
+# (workers only overlap network latency; the shared limiter keeps the rate polite)
+MAX_WORKERS = 2
+REQUESTS_PER_SECOND = 1
+
+# Tries per page before it is reported as failed (transient errors beyond the
+# adapter's HTTP-status retries, e.g. timeouts or dropped connections)
+PAGE_ATTEMPTS = 2
+
+# One pooled session so keep-alive connections are reused across pages
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+))
+
+# "Results 1-100 of 1234" / "1234 Results" in the list footer
+_RE_RESULTS_RANGE = re.compile(r'Results \d+\s*[-\u2013]\s*\d+ of (\d+)')
+_RE_RESULTS_COUNT = re.compile(r'(\d+) Results', re.IGNORECASE)
+
+# Only result rows are materialized when parsing pages past the first. The
+# strainer sees the raw class attribute, so match one token of it.
+_RESULT_ROWS = SoupStrainer('li', class_=lambda c: c is not None and 'list-active' in c.split())
+
+# HH:MM:SS or MM:SS
+_TIME_RE = re.compile(r'^\s*(?:(\d+):)?(\d+):(\d+)\s*$')
+
+
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+
 
 def build_url(event_config: Dict, gender: str, page: int = 1) -> str:
     """Build results page URL."""
@@ -60,30 +120,88 @@ def build_url(event_config: Dict, gender: str, page: int = 1) -> str:
     return base + '?' + urlencode(params)
 
 
+@functools.lru_cache(maxsize=16384)
 def parse_time(time_str: str) -> float:
-    """Parse HH:MM:SS to seconds."""
-    if not time_str: return None
-    try:
-        parts = time_str.strip().split(':')
-        if len(parts) == 3:
-            return int(parts[0])*3600 + int(parts[1])*60 + int(parts[2])
-        elif len(parts) == 2:
-            return int(parts[0])*60 + int(parts[1])
-    except:
+    """Parse HH:MM:SS to seconds (memoized; finish times repeat at second resolution)."""
+    # Fast path for the usual fixed-width "HH:MM:SS"
+    if (time_str and len(time_str) == 8 and time_str[2] == ':' and time_str[5] == ':'
+            and time_str[:2].isdecimal() and time_str[3:5].isdecimal() and time_str[6:].isdecimal()):
+        return int(time_str[:2])*3600 + int(time_str[3:5])*60 + int(time_str[6:])
+    
+    m = _TIME_RE.match(time_str) if time_str else None
+    if not m:
         return None
-    return None
+    hours, minutes, seconds = m.groups()
+    return (int(hours) if hours else 0)*3600 + int(minutes)*60 + int(seconds)
 
 
-def scrape_page(url: str, event_name: str, gender: str) -> List[Dict]:
-    """Scrape a single page."""
+def cache_path(url: str) -> Path:
+    """On-disk cache location for a page (keyed by the full URL, query included)."""
+    return HTTP_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.html"
+
+
+def fetch_content(url: str) -> bytes:
+    """
+    GET a results page through the on-disk HTTP cache.
+    
+    Fresh cached pages are returned without touching the network or the rate
+    limiter. Raises requests exceptions on failure.
+    """
+    path = cache_path(url)
+    if USE_HTTP_CACHE and path.exists() and time.time() - path.stat().st_mtime < HTTP_CACHE_TTL.total_seconds():
+        return path.read_bytes()
+    
+    _rate_limiter.wait()
+    resp = SESSION.get(url, timeout=30)
+    resp.raise_for_status()
+    
+    if USE_HTTP_CACHE:
+        # Write-then-rename so concurrent page workers never see a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(resp.content)
+        os.replace(tmp_path, path)
+    return resp.content
+
+
+def fetch_soup(url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+    """Fetch and parse a results page with lxml (None on failure)."""
     try:
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
+        content = fetch_content(url)
     except Exception as e:
         print(f"Error fetching {url}: {e}")
-        return []
+        return None
+
+    return BeautifulSoup(content, 'lxml', parse_only=parse_only)
+
+
+def parse_total_results(soup: BeautifulSoup) -> int:
+    """Read the division's total result count from the page (0 if not shown)."""
+    count_elem = soup.find('span', class_='str_num')
+    if count_elem:
+        match = re.search(r'(\d+)', count_elem.text)
+        if match:
+            return int(match.group(1))
 
-    soup = BeautifulSoup(resp.content, 'html.parser')
+    text = soup.get_text(' ')
+    for pattern in (_RE_RESULTS_RANGE, _RE_RESULTS_COUNT):
+        match = pattern.search(text)
+        if match:
+            return int(match.group(1))
+    return 0
+
+
+def scrape_page(url: str, event_name: str, gender: str) -> Optional[List[Dict]]:
+    """Scrape a single page (result rows only); None if the fetch failed."""
+    soup = fetch_soup(url, parse_only=_RESULT_ROWS)
+    if soup is None:
+        return None
+    return parse_results(soup, event_name, gender)
+
+
+def parse_results(soup: BeautifulSoup, event_name: str, gender: str) -> List[Dict]:
+    """Extract result rows from a parsed results page."""
     rows = soup.find_all('li', class_='list-active')
     results = []
 
@@ -117,48 +235,148 @@ def scrape_page(url: str, event_name: str, gender: str) -> List[Dict]:
     return results
 
 
+def scrape_page_numbered(config: Dict, gender: str, page: int) -> Optional[List[Dict]]:
+    """
+    Scrape one page of a leaderboard, tagging each row with its page number.
+    
+    The fetch is retried up to PAGE_ATTEMPTS times; returns None if every
+    attempt failed, so callers can tell a failed page from an empty one.
+    """
+    url = build_url(config, gender, page)
+    for _ in range(PAGE_ATTEMPTS):
+        results = scrape_page(url, config['name'], gender)
+        if results is not None:
+            break
+    else:
+        return None
+    
+    for row in results:
+        row['page'] = page
+    return results
+
+
+def scrape_division(config: Dict, gender: str, writer: csv.DictWriter,
+                    sample_pages: Optional[int] = None, rng: Optional[random.Random] = None) -> int:
+    """
+    Scrape one (event, gender) leaderboard into the CSV writer.
+    
+    Page 1 is fetched first to read the total result count; the remaining
+    pages are then fetched concurrently. If the count is not shown, pages are
+    walked one by one until an empty page. Rows are written from this thread
+    only, in page (rank) order, as soon as each page and those before it have
+    arrived. Pages that still fail after retrying are reported, not written.
+    
+    Args:
+        sample_pages: If set, only this many pages, drawn uniformly at random
+            from the whole leaderboard, are kept (needs the result count)
+        rng: Random source for the page draw
+    
+    Returns:
+        Number of rows written
+    """
+    soup = fetch_soup(build_url(config, gender, 1))
+    if soup is None:
+        print("    Page 1 failed; skipping this division")
+        return 0
+    
+    first_page = parse_results(soup, config['name'], gender)
+    if not first_page:
+        return 0
+    for row in first_page:
+        row['page'] = 1
+    print(f"    Page 1: Found {len(first_page)} results")
+    
+    total = parse_total_results(soup)
+    if not total:
+        if sample_pages:
+            print("    Result count not shown; scraping every page instead of sampling")
+        writer.writerows(first_page)
+        written = len(first_page)
+        page = 1
+        while page < MAX_PAGES:
+            page += 1
+            results = scrape_page_numbered(config, gender, page)
+            if results is None:
+                print(f"    WARNING: page {page} failed; stopping the walk here")
+                break
+            if not results:
+                break
+            writer.writerows(results)
+            written += len(results)
+            print(f"    Page {page}: Found {len(results)} results")
+        return written
+    
+    last_page = min(math.ceil(total / RESULTS_PER_PAGE), MAX_PAGES)
+    print(f"    {total} results across {last_page} pages")
+    
+    pages = range(1, last_page + 1)
+    if sample_pages:
+        pages = sorted((rng or random).sample(pages, min(sample_pages, last_page)))
+        print(f"    Sampled pages: {pages}")
+    
+    written = 0
+    if 1 in pages:
+        writer.writerows(first_page)
+        written = len(first_page)
+    
+    other_pages = [page for page in pages if page != 1]
+    failed = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # map() yields in submission order, so rows land in page (rank) order
+        page_results = executor.map(lambda page: scrape_page_numbered(config, gender, page), other_pages)
+        for page, results in tqdm(zip(other_pages, page_results), total=len(other_pages),
+                                  desc='    Pages', leave=False):
+            if results is None:
+                failed.append(page)
+                continue
+            writer.writerows(results)
+            written += len(results)
+    
+    if failed:
+        print(f"    WARNING: {len(failed)} page(s) failed after {PAGE_ATTEMPTS} attempts and were not written: {failed}")
+    
+    return written
+
+
 def main():
+    global USE_HTTP_CACHE
+    
+    parser = argparse.ArgumentParser(description='Scrape full leaderboards for sampling research')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk HTTP page cache')
+    parser.add_argument('--sample-pages', type=int, metavar='K',
+                        help=f'Fetch only K random pages per leaderboard (written to {SAMPLED_OUTPUT_FILE})')
+    parser.add_argument('--seed', type=int, help='Random seed for --sample-pages')
+    args = parser.parse_args()
+    USE_HTTP_CACHE = not args.no_cache
+    
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    all_results = []
+    total_written = 0
+    rng = random.Random(args.seed)
     
     print("Starting full leaderboard scrape for research...")
     
-    for key, config in RESEARCH_EVENTS.items():
-        print(f"\nScraping {config['name']}...")
-        
-        for div_name, gender_code in DIVISIONS.items():
-            print(f"  Division: {div_name.capitalize()}")
-            page = 1
-            while True:
-                url = build_url(config, gender_code, page)
-                # print(f"    Fetching {url}") 
-                results = scrape_page(url, config['name'], gender_code)
-                
-                if not results:
-                    break
-                    
-                all_results.extend(results)
-                print(f"    Page {page}: Found {len(results)} results")
-                
-                # Safety break if we get 0 results (already handled) or just seemingly valid end
-                if len(results) == 0:  
-                    break
-                    
-                page += 1
-                if page > 150: # Increased limit
-                    print("    reached max page limit")
-                    break
-                    
-                time.sleep(1) # Be nice
-                
-    # Save to CSV
     keys = ['venue', 'gender', 'rank', 'name', 'finish_time', 'finish_seconds']
-    with open(OUTPUT_FILE, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
+    output_file = OUTPUT_FILE
+    if args.sample_pages:
+        # Record which page each sampled row came from for auditing
+        keys.append('page')
+        output_file = SAMPLED_OUTPUT_FILE
+    
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=keys, extrasaction='ignore')
         writer.writeheader()
-        writer.writerows(all_results)
         
-    print(f"\nSaved {len(all_results)} total records to {OUTPUT_FILE}")
+        for key, config in RESEARCH_EVENTS.items():
+            print(f"\nScraping {config['name']}...")
+            
+            for div_name, gender_code in DIVISIONS.items():
+                print(f"  Division: {div_name.capitalize()}")
+                written = scrape_division(config, gender_code, writer, args.sample_pages, rng)
+                f.flush()  # Keep completed divisions on disk if a later one fails
+                total_written += written
+                print(f"    Collected {written} results")
+        
+    print(f"\nSaved {total_written} total records to {output_file}")
 
 
 if __name__ == '__main__':
@@ -4,13 +4,21 @@ Test configuration and fixtures.
 Shared pytest configuration for all test modules.
 """
 
+import json
 import pytest
 import sys
 from pathlib import Path
 
+import pandas as pd
+
 # Add parent directory to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+PROJECT_ROOT = Path(__file__).parent.parent
+VENUES_FILE = PROJECT_ROOT / 'execution' / 'venues.json'
+HANDICAPS_FILE = PROJECT_ROOT / 'data' / 'venue_handicaps_10venues_1000each.csv'
+RESULTS_FILE = PROJECT_ROOT / 'data' / 'hyrox_9venues_100each.csv'
+
 
 def pytest_configure(config):
     """Configure pytest with custom markers."""
@@ -23,3 +31,38 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "integration: mark test as an integration test"
     )
+
+
+# Shared data files are parsed once per test session; tests must not mutate them
+
+@pytest.fixture(scope='session')
+def venues_json():
+    """Parsed execution/venues.json."""
+    with open(VENUES_FILE, 'r') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='session')
+def handicaps_df():
+    """Venue handicaps CSV."""
+    return pd.read_csv(HANDICAPS_FILE)
+
+
+@pytest.fixture(scope='session')
+def results_df():
+    """Processed results CSV."""
+    return pd.read_csv(RESULTS_FILE)
+
+
+@pytest.fixture(scope='session')
+def data_quality_stats(results_df):
+    """Aggregates of the results CSV used by the data-quality checks."""
+    finish = results_df['finish_seconds']
+    return {
+        'rows': len(results_df),
+        'duplicates': int(results_df.duplicated(subset=['venue', 'gender', 'name']).sum()),
+        'has_na': bool(finish.isna().any()),
+        'min_seconds': float(finish.min()),
+        'max_seconds': float(finish.max()),
+        'genders': set(results_df['gender'].unique()),
+    }
@@ -6,6 +6,7 @@ Tests the integration of scraping, processing, and handicap calculation componen
 
 import pytest
 import pandas as pd
+import gzip
 import json
 from pathlib import Path
 import sys
@@ -13,7 +14,7 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from execution.process_scraped_data import parse_time_to_seconds
+from execution.process_scraped_data import parse_time_to_seconds, process_scraped_data
 
 
 class TestDataProcessing:
@@ -54,6 +55,19 @@ class TestDataProcessing:
         """Test parsing invalid time returns None."""
         assert parse_time_to_seconds("invalid") is None
         assert parse_time_to_seconds("") is None
+    
+    def test_process_gzip_input(self, sample_scraped_data, tmp_path):
+        """Test processing gzip-compressed raw scrape output."""
+        input_file = tmp_path / 'hyrox_scraped_raw.json.gz'
+        with gzip.open(input_file, 'wt', encoding='utf-8') as f:
+            json.dump(sample_scraped_data, f)
+        
+        output_file = tmp_path / 'results.csv'
+        df = process_scraped_data(input_file, output_file)
+        
+        assert output_file.exists()
+        # Top 80% of 2 results keeps the faster athlete only
+        assert df['finish_seconds'].tolist() == [3600]
 
 
 class TestHandicapCalculation:
@@ -92,20 +106,13 @@ class TestVenueConfiguration:
         venues_file = Path(__file__).parent.parent / 'execution' / 'venues.json'
         assert venues_file.exists()
     
-    def test_venues_json_valid(self):
+    def test_venues_json_valid(self, venues_json):
         """Test that venues.json is valid JSON."""
-        venues_file = Path(__file__).parent.parent / 'execution' / 'venues.json'
-        with open(venues_file, 'r') as f:
-            data = json.load(f)
-        assert 'season_8_2025_2026' in data
+        assert 'season_8_2025_2026' in venues_json
     
-    def test_venue_structure(self):
+    def test_venue_structure(self, venues_json):
         """Test that each venue has required fields."""
-        venues_file = Path(__file__).parent.parent / 'execution' / 'venues.json'
-        with open(venues_file, 'r') as f:
-            data = json.load(f)
-        
-        for venue_key, venue_data in data['season_8_2025_2026'].items():
+        for venue_key, venue_data in venues_json['season_8_2025_2026'].items():
             assert 'event_id' in venue_data
             assert 'name' in venue_data
             assert 'location' in venue_data
@@ -120,10 +127,9 @@ class TestDataFiles:
         handicaps_file = Path(__file__).parent.parent / 'data' / 'venue_handicaps_10venues_1000each.csv'
         assert handicaps_file.exists()
     
-    def test_handicaps_file_valid(self):
+    def test_handicaps_file_valid(self, handicaps_df):
         """Test that handicaps CSV is valid."""
-        handicaps_file = Path(__file__).parent.parent / 'data' / 'venue_handicaps_10venues_1000each.csv'
-        df = pd.read_csv(handicaps_file)
+        df = handicaps_df
         
         # Check required columns
         assert 'venue' in df.columns
@@ -141,10 +147,9 @@ class TestDataFiles:
         results_file = Path(__file__).parent.parent / 'data' / 'hyrox_9venues_100each.csv'
         assert results_file.exists()
     
-    def test_results_file_valid(self):
+    def test_results_file_valid(self, results_df):
         """Test that results CSV has expected structure."""
-        results_file = Path(__file__).parent.parent / 'data' / 'hyrox_9venues_100each.csv'
-        df = pd.read_csv(results_file)
+        df = results_df
         
         # Check required columns
         required_cols = ['venue', 'gender', 'name', 'finish_time', 'finish_seconds']
@@ -158,36 +163,25 @@ class TestDataFiles:
 class TestDataQuality:
     """Test data quality and integrity."""
     
-    def test_no_excessive_duplicates(self):
+    def test_no_excessive_duplicates(self, data_quality_stats):
         """Test that there are not excessive duplicate results."""
-        results_file = Path(__file__).parent.parent / 'data' / 'hyrox_9venues_100each.csv'
-        df = pd.read_csv(results_file)
-        
-        # Check for duplicates based on venue, gender, name (exact duplicates)
-        duplicates = df.duplicated(subset=['venue', 'gender', 'name'])
+        # Duplicates based on venue, gender, name (exact duplicates)
         # Allow for some tied ranks, but not excessive duplication
-        assert duplicates.sum() < len(df) * 0.01  # Less than 1% duplicates
+        assert data_quality_stats['duplicates'] < data_quality_stats['rows'] * 0.01  # Less than 1% duplicates
     
-    def test_finish_times_valid(self):
+    def test_finish_times_valid(self, data_quality_stats):
         """Test that all finish times are valid."""
-        results_file = Path(__file__).parent.parent / 'data' / 'hyrox_9venues_100each.csv'
-        df = pd.read_csv(results_file)
-        
         # Check no null finish times
-        assert df['finish_seconds'].notna().all()
+        assert not data_quality_stats['has_na']
         
         # Check finish times are reasonable (30 min to 3 hours)
-        assert df['finish_seconds'].min() > 1800  # > 30 minutes
-        assert df['finish_seconds'].max() < 10800  # < 3 hours
+        assert data_quality_stats['min_seconds'] > 1800  # > 30 minutes
+        assert data_quality_stats['max_seconds'] < 10800  # < 3 hours
     
-    def test_gender_distribution(self):
+    def test_gender_distribution(self, data_quality_stats):
         """Test that we have both M and W results."""
-        results_file = Path(__file__).parent.parent / 'data' / 'hyrox_9venues_100each.csv'
-        df = pd.read_csv(results_file)
-        
-        genders = df['gender'].unique()
-        assert 'M' in genders
-        assert 'W' in genders
+        assert 'M' in data_quality_stats['genders']
+        assert 'W' in data_quality_stats['genders']
 
 
 if __name__ == "__main__":
@@ -16,11 +16,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'web'))
 from web.app import app
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def client():
-    """Create test client for Flask app."""
+    """
+    Create test client for Flask app.
+    
+    Shared by the whole session (tests only read app state); one warmup
+    request pays any first-request cost up front.
+    """
     app.config['TESTING'] = True
     with app.test_client() as client:
+        client.get('/venues')
         yield client
 
 
@@ -126,6 +132,26 @@ class TestTimeConversion:
         assert response.status_code == 400
         data = response.get_json()
         assert 'error' in data
+    
+    def test_convert_malformed_json(self, client):
+        """Test that a malformed JSON body returns a JSON error."""
+        response = client.post('/convert', data='{not json', content_type='application/json')
+        
+        assert response.status_code == 400
+        data = response.get_json()
+        assert 'error' in data
+    
+    def test_convert_oversized_body(self, client):
+        """Test that an oversized body is rejected before parsing."""
+        response = client.post('/convert', json={
+            'finish_time': '01:30:00',
+            'from_venue': 'x' * 2000,
+            'gender': 'M'
+        })
+        
+        assert response.status_code == 413
+        data = response.get_json()
+        assert 'error' in data
 
 
 class TestVenueCorrections:
@@ -161,6 +187,33 @@ class TestVenueCorrections:
         assert corrections == sorted(corrections)  # Should be sorted ascending
 
 
+class TestStatistics:
+    """Test the statistics page aggregates."""
+    
+    def test_benchmark_na_when_top80_empty(self, monkeypatch):
+        """A gender too small for a top-80% cut gets no benchmark."""
+        import pandas as pd
+        import web.app as web_app
+        
+        venue = web_app.SORTED_MEN_CORRECTIONS[0][0]
+        df = pd.DataFrame({
+            'venue': [venue] * 11,
+            'gender': ['M'] * 10 + ['W'],
+            'finish_seconds': [4000 + 60 * i for i in range(10)] + [5000],
+        })
+        captured = {}
+        monkeypatch.setattr(web_app, 'load_results', lambda: df)
+        monkeypatch.setattr(web_app, 'render_template', lambda name, **kwargs: captured.update(kwargs))
+        
+        web_app.render_statistics(False)
+        
+        row = captured['stats_data'][0]
+        assert row['name'] == venue
+        assert row['count'] == 8
+        assert row['men_benchmark'] == web_app.format_time(4000 + 60 * 4)
+        assert row['women_benchmark'] == 'N/A'
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -15,6 +15,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'web'))
 
 from web.utils.time_utils import parse_time_to_seconds, format_time
 from execution.process_scraped_data import parse_time_to_seconds as parse_time_processing
+from execution.clean_hyrox_data import (
+    parse_time_to_seconds as parse_time_cleaning,
+    parse_time_series_to_seconds,
+)
 
 
 class TestTimeParsing:
@@ -100,6 +104,25 @@ class TestDataValidation:
         """Test parsing MM:SS format."""
         result = parse_time_processing("90:45")
         assert result == 5445
+    
+    def test_vectorized_parse_matches_scalar(self):
+        """Test the column parser agrees with the scalar parser on every input."""
+        import math
+        import pandas as pd
+        
+        values = [
+            "1:23:45", "45:30", "3825", "1:00:00.5", "  01:30:45  ",
+            " 5 : 00", "+5:00", "-1:02", "1_0:00", "1e1:00",
+            "invalid", "1:2:3:4", "", None,
+        ]
+        parsed = parse_time_series_to_seconds(pd.Series(values, dtype=object))
+        
+        for value, result in zip(values, parsed):
+            expected = parse_time_cleaning(value)
+            if expected is None:
+                assert math.isnan(result), value
+            else:
+                assert result == expected, value
 
 
 class TestEdgeCases:
@@ -7,8 +7,9 @@ gender-specific course correction factors.
 """
 
 from flask import Flask, render_template, request, jsonify
-import pandas as pd
-from pathlib import Path
+from flask.json.provider import DefaultJSONProvider
+import math
+import numpy as np
 import os
 
 # Import utility functions
@@ -21,18 +22,71 @@ from utils import (
     format_time,
     BASELINE_MEN_MEDIAN,
     BASELINE_WOMEN_MEDIAN,
-    get_race_results,
-    get_all_results,
-    get_db_connection
+    get_results_frame,
+    get_db_connection,
+    get_db_version
 )
 
+# Optional faster JSON encoding for API responses
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    
+    Honours the provider's sort_keys; output is always compact unless an
+    indent is requested.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if HAS_ORJSON:
+    app.json = OrjsonProvider(app)
+# Compact, unsorted JSON even in debug mode (clients never rely on key order)
+app.json.compact = True
+app.json.sort_keys = False
+# Serve '/venues/' as '/venues' instead of redirecting; set before routes are added
+app.url_map.strict_slashes = False
 
 # Load venue corrections and identify baseline
 VENUE_CORRECTIONS = load_venue_corrections()
 BASELINE_VENUE = get_baseline_venue(VENUE_CORRECTIONS)
 VENUES = sorted(list(set(list(VENUE_CORRECTIONS['men'].keys()) + list(VENUE_CORRECTIONS['women'].keys()))))
 
+# Percentage corrections and their display strings, per venue and gender
+MEN_PCT = {
+    venue: calculate_percentage_correction(correction, BASELINE_MEN_MEDIAN)
+    for venue, correction in VENUE_CORRECTIONS['men'].items()
+}
+WOMEN_PCT = {
+    venue: calculate_percentage_correction(correction, BASELINE_WOMEN_MEDIAN)
+    for venue, correction in VENUE_CORRECTIONS['women'].items()
+}
+MEN_DISP = {venue: format_correction(pct) for venue, pct in MEN_PCT.items()}
+WOMEN_DISP = {venue: format_correction(pct) for venue, pct in WOMEN_PCT.items()}
+
+# Venues ordered by men's correction (fastest first), shared by the list views
+SORTED_MEN_CORRECTIONS = tuple(sorted(VENUE_CORRECTIONS['men'].items(), key=lambda x: x[1]))
+FASTEST_VENUE = SORTED_MEN_CORRECTIONS[0][0]
+SLOWEST_VENUE = SORTED_MEN_CORRECTIONS[-1][0]
+SLOWEST_DIFF = MEN_DISP[SLOWEST_VENUE]
+
 # Helper to look up country flags (basic mapping)
 VENUE_FLAGS = {
     'London': '🇬🇧', 'Manchester': '🇬🇧', 'Birmingham': '🇬🇧', 'Glasgow': '🇬🇧',
@@ -88,6 +142,17 @@ def format_seconds_mmss(seconds):
     return f"{sign}{mins}:{secs:02d}"
 
 
+def json_times(times):
+    """Times array for template JSON: passed through as numpy under orjson, else listed."""
+    return times if HAS_ORJSON else times.tolist()
+
+
+def upper_median(times):
+    """Middle element of the sorted times (upper middle for even counts), in O(n)."""
+    mid = len(times) // 2
+    return int(np.partition(times, mid)[mid])
+
+
 def get_correction_table_data():
     """Prepare sorted list of venue corrections for the UI."""
     data = []
@@ -99,9 +164,9 @@ def get_correction_table_data():
         men_sec = VENUE_CORRECTIONS['men'].get(venue, 0.0)
         women_sec = VENUE_CORRECTIONS['women'].get(venue, 0.0)
         
-        # Calculate percentages (inverted logic: negative time = positive pct)
-        men_pct = calculate_percentage_correction(men_sec, BASELINE_MEN_MEDIAN)
-        women_pct = calculate_percentage_correction(women_sec, BASELINE_WOMEN_MEDIAN)
+        # Percentages (inverted logic: negative time = positive pct); a missing gender counts as 0
+        men_pct = MEN_PCT.get(venue, 0.0)
+        women_pct = WOMEN_PCT.get(venue, 0.0)
         
         # Overall is roughly the average of the two percentages
         overall_pct = (men_pct + women_pct) / 2
@@ -118,8 +183,8 @@ def get_correction_table_data():
             'men_pct_val': men_pct,
             'women_pct_val': women_pct,
             'overall_pct_val': overall_pct,
-            'men_display': format_correction(men_pct),
-            'women_display': format_correction(women_pct),
+            'men_display': MEN_DISP.get(venue, '0%'),
+            'women_display': WOMEN_DISP.get(venue, '0%'),
             'overall_display': format_correction(overall_pct),
             'men_mmss': format_seconds_mmss(men_sec),
             'women_mmss': format_seconds_mmss(women_sec),
@@ -145,6 +210,9 @@ def get_correction_table_data():
     return data
 
 
+# The correction table only depends on the static corrections, so build it once
+CORRECTION_TABLE = get_correction_table_data()
+
 
 @app.route('/')
 def index():
@@ -154,7 +222,7 @@ def index():
     show_feedback_popup = os.environ.get('HYROX_SHOW_FEEDBACK_POPUP', 'true').lower() == 'true'
 
     # Get prepared table data
-    venue_rows = get_correction_table_data()
+    venue_rows = CORRECTION_TABLE
 
     return render_template('index.html', 
                          venues=VENUES, 
@@ -164,10 +232,38 @@ def index():
                          show_feedback_popup=show_feedback_popup)
 
 
+def build_convert_meta(corrections, baseline_median):
+    """Per-venue /convert response fields ('from_*' and 'to_*') for one gender."""
+    from_meta, to_meta = {}, {}
+    for venue, correction in corrections.items():
+        display = format_correction(calculate_percentage_correction(correction, baseline_median))
+        from_meta[venue] = {'from_venue': venue, 'from_correction': correction, 'from_correction_display': display}
+        to_meta[venue] = {'to_venue': venue, 'to_correction': correction, 'to_correction_display': display}
+    return from_meta, to_meta
+
+
+# Venue-constant parts of the /convert response, keyed by gender code
+CONVERT_META = {
+    'M': build_convert_meta(VENUE_CORRECTIONS['men'], BASELINE_MEN_MEDIAN),
+    'W': build_convert_meta(VENUE_CORRECTIONS['women'], BASELINE_WOMEN_MEDIAN),
+}
+# /convert bodies are a handful of short fields; anything larger is rejected unparsed
+MAX_CONVERT_BODY = 1024
+
+NORMALIZED_TO_META = {'to_venue': 'Normalized (Reference)', 'to_correction': 0.0, 'to_correction_display': '0.0%'}
+GENDER_LABELS = {'M': 'Men', 'W': 'Women'}
+
+
 @app.route('/convert', methods=['POST'])
 def convert():
     """Handle time conversion request."""
-    data = request.get_json()
+    if request.content_length and request.content_length > MAX_CONVERT_BODY:
+        return jsonify({'error': 'Request body too large'}), 413
+    
+    # Malformed or non-object JSON falls through to the field validation below
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
     
     finish_time = data.get('finish_time')
     from_venue = data.get('from_venue')
@@ -185,73 +281,101 @@ def convert():
         return jsonify({'error': 'Invalid time format. Use HH:MM:SS or MM:SS'}), 400
     
     # Get gender-specific corrections
-    gender_key = 'men' if gender == 'M' else 'women'
-    corrections = VENUE_CORRECTIONS[gender_key]
-    baseline_median = BASELINE_MEN_MEDIAN if gender == 'M' else BASELINE_WOMEN_MEDIAN
+    from_metas, to_metas = CONVERT_META[gender]
     
-    if from_venue not in corrections:
+    # One lookup doubles as the membership test
+    from_meta = from_metas.get(from_venue)
+    if from_meta is None:
         return jsonify({'error': f'Unknown venue: {from_venue}'}), 400
     
     # Convert time using additive corrections
     if to_venue == 'normalized':
-        # Normalize to reference venue (correction = 0.0)
-        from_correction = corrections[from_venue]
-        # Remove the from_venue correction to get normalized time
-        converted_seconds = time_seconds - from_correction
-        result_venue = 'Normalized (Reference)'
-        to_correction = 0.0
-        to_correction_pct = 0.0
+        # Normalize to reference venue (correction = 0.0):
+        # remove the from_venue correction to get normalized time
+        to_meta = NORMALIZED_TO_META
+        converted_seconds = time_seconds - from_meta['from_correction']
     else:
-        if to_venue not in corrections:
+        to_meta = to_metas.get(to_venue)
+        if to_meta is None:
             return jsonify({'error': f'Unknown target venue: {to_venue}'}), 400
         
-        from_correction = corrections[from_venue]
-        to_correction = corrections[to_venue]
         # Remove from_venue correction, then apply to_venue correction
-        converted_seconds = time_seconds - from_correction + to_correction
-        result_venue = to_venue
-        to_correction_pct = calculate_percentage_correction(to_correction, baseline_median)
-    
-    # Calculate percentage corrections (inverted)
-    from_correction_pct = calculate_percentage_correction(from_correction, baseline_median)
+        converted_seconds = time_seconds - from_meta['from_correction'] + to_meta['to_correction']
     
     # Calculate time difference
     time_diff = converted_seconds - time_seconds
     
+    # format_time floors anyway; flooring here keeps its memo keys to whole seconds
+    converted_time = format_time(math.floor(converted_seconds))
+    time_difference = format_time(math.floor(abs(time_diff)))
+    
     return jsonify({
+        **from_meta,
+        **to_meta,
         'original_time': finish_time,
         'original_seconds': time_seconds,
-        'from_venue': from_venue,
-        'from_correction': from_correction,
-        'from_correction_display': format_correction(from_correction_pct),
-        'gender': 'Men' if gender == 'M' else 'Women',
-        'to_venue': result_venue,
-        'to_correction': to_correction,
-        'to_correction_display': format_correction(to_correction_pct) if to_venue != 'normalized' else '0.0%',
-        'converted_time': format_time(converted_seconds),
+        'gender': GENDER_LABELS[gender],
+        'converted_time': converted_time,
         'converted_seconds': converted_seconds,
-        'time_difference': format_time(abs(time_diff)),
+        'time_difference': time_difference,
         'faster': time_diff < 0,
     })
 
 
+def build_venues_payload():
+    """List of venues and their course corrections, sorted by men's correction."""
+    payload = []
+    for venue, correction in SORTED_MEN_CORRECTIONS:
+        correction_display = MEN_DISP[venue]
+        payload.append({
+            'name': venue,
+            'correction': correction,
+            'correction_pct': MEN_PCT[venue],
+            'correction_display': correction_display,
+            'correction_label': 'Baseline' if venue == BASELINE_VENUE else correction_display
+        })
+    return payload
+
+
+# Corrections are fixed for the life of the process, so serialize /venues once
+# (compact, like jsonify outside debug mode)
+VENUES_JSON = app.json.dumps(build_venues_payload(), separators=(',', ':')) + '\n'
+
+
 @app.route('/venues')
 def venues():
     """Return list of venues and their course corrections."""
-    # Use men's corrections for sorting/display
-    men_corrections = VENUE_CORRECTIONS['men']
-    venue_data = [
-        {
-            'name': venue,
-            'correction': correction,
-            'correction_pct': calculate_percentage_correction(correction, BASELINE_MEN_MEDIAN),
-            'correction_display': format_correction(calculate_percentage_correction(correction, BASELINE_MEN_MEDIAN)),
-            'correction_label': 'Baseline' if venue == BASELINE_VENUE else format_correction(calculate_percentage_correction(correction, BASELINE_MEN_MEDIAN))
-        }
-        for venue, correction in sorted(men_corrections.items(), key=lambda x: x[1])
-    ]
-    
-    return jsonify(venue_data)
+    return app.response_class(VENUES_JSON, mimetype='application/json')
+
+
+# Results frame shared by the data views, reloaded only when the database changes:
+# {'frame': (db_version, DataFrame)}
+_RESULTS_CACHE = {}
+
+
+def load_results():
+    """Results table (venue, gender, finish_seconds), read once per database version."""
+    version = get_db_version()
+    cached = _RESULTS_CACHE.get('frame')
+    if cached is None or cached[0] != version:
+        cached = (version, get_results_frame())
+        _RESULTS_CACHE['frame'] = cached
+    return cached[1]
+
+
+# Rendered data pages, kept until the results database changes:
+# {page_name: ((db_version, *flags), html)}
+_PAGE_CACHE = {}
+
+
+def cached_page(name, render, *flags):
+    """Return render(*flags), re-rendering only when the database or the flags change."""
+    key = (get_db_version(), *flags)
+    cached = _PAGE_CACHE.get(name)
+    if cached is None or cached[0] != key:
+        cached = (key, render(*flags))
+        _PAGE_CACHE[name] = cached
+    return cached[1]
 
 
 @app.route('/analysis')
@@ -259,11 +383,18 @@ def analysis():
     """Render the venue analysis page with gender-specific distribution charts."""
     # Check if admin mode is enabled via environment variable
     admin_mode = os.environ.get('HYROX_ADMIN_MODE', 'false').lower() == 'true'
+    show_feedback_popup = os.environ.get('HYROX_SHOW_FEEDBACK_POPUP', 'true').lower() == 'true'
     
+    # Reuse the rendered page while the data and flags are unchanged
+    return cached_page('analysis', render_analysis, admin_mode, show_feedback_popup)
+
+
+def render_analysis(admin_mode, show_feedback_popup):
+    """Build the analysis page HTML from the full results table."""
     # Fetch all results from the database
-    results = get_all_results()
+    df = load_results()
     
-    if results:
+    if not df.empty:
         # Prepare data for box plots (overall, men, women)
         venue_data_all = []
         men_data = []
@@ -275,73 +406,66 @@ def analysis():
         # Use men's corrections for sorting/display
         men_corrections = VENUE_CORRECTIONS['men']
         
-        # Group records by venue and gender for processing
-        venues_dist = {}
-        for row in results:
-            v = row['venue']
-            g = row['gender']
-            t = row['finish_seconds']
-            
-            # Filter outliers as requested:
-            # < 50 mins (3000s) likely errors
-            # > 2:30 (150 mins = 9000s) likely errors/injuries
-            if t < 3000 or t > 9000:
-                continue
-            
-            if v not in venues_dist:
-                venues_dist[v] = {'all': [], 'M': [], 'W': []}
-            venues_dist[v]['all'].append(t)
-            # Use 'M' or 'W' directly as they match keys from row['gender']
-            if g in ['M', 'W']:
-                venues_dist[v][g].append(t)
-
-        for idx, (venue, correction) in enumerate(sorted(men_corrections.items(), key=lambda x: x[1])):
-            if venue not in venues_dist:
+        # Filter outliers as requested:
+        # < 50 mins (3000s) likely errors
+        # > 2:30 (150 mins = 9000s) likely errors/injuries
+        in_range = df[df['finish_seconds'].between(3000, 9000)]
+        
+        # Bucket row positions by (venue, gender) in one pass over the category
+        # codes, then slice the times array per venue (table order kept)
+        times = in_range['finish_seconds'].to_numpy()
+        rows_by_venue_gender = in_range.groupby(['venue', 'gender'], sort=False, observed=True).indices
+        no_rows = np.empty(0, dtype=np.intp)
+
+        for idx, (venue, correction) in enumerate(SORTED_MEN_CORRECTIONS):
+            men_rows = rows_by_venue_gender.get((venue, 'M'), no_rows)
+            women_rows = rows_by_venue_gender.get((venue, 'W'), no_rows)
+            if not men_rows.size and not women_rows.size:
                 continue
                 
-            venue_times_all = venues_dist[venue]['all']
-            venue_times_men = venues_dist[venue]['M']
-            venue_times_women = venues_dist[venue]['W']
+            venue_times_all = times[np.sort(np.concatenate((men_rows, women_rows)))]
+            venue_times_men = times[men_rows]
+            venue_times_women = times[women_rows]
             
             color = colors[idx % len(colors)]
             
-            if venue_times_all:
+            if len(venue_times_all):
                 venue_data_all.append({
                     'name': venue,
-                    'times': venue_times_all,
+                    'times': json_times(venue_times_all),
                     'color': color
                 })
             
-            if venue_times_men:
+            if len(venue_times_men):
                 men_data.append({
                     'name': venue,
-                    'times': venue_times_men,
+                    'times': json_times(venue_times_men),
                     'color': color
                 })
             
-            if venue_times_women:
+            if len(venue_times_women):
                 women_data.append({
                     'name': venue,
-                    'times': venue_times_women,
+                    'times': json_times(venue_times_women),
                     'color': color
                 })
             
-            if venue_times_all:
-                correction_pct = calculate_percentage_correction(correction, BASELINE_MEN_MEDIAN)
+            if len(venue_times_all):
+                correction_display = MEN_DISP[venue]
                 
                 # Calculate medians
-                overall_median_sec = sorted(venue_times_all)[len(venue_times_all) // 2]
+                overall_median_sec = upper_median(venue_times_all)
                 
                 men_median_str = "N/A"
-                if venue_times_men:
-                    men_med_sec = sorted(venue_times_men)[len(venue_times_men) // 2]
+                if len(venue_times_men):
+                    men_med_sec = upper_median(venue_times_men)
                     # Strip leading zero on hours if possible or just use standard format
                     men_median_str = format_time(men_med_sec)
                     if men_median_str.startswith("0"): men_median_str = men_median_str[1:] # e.g. 1:18
 
                 women_median_str = "N/A"
-                if venue_times_women:
-                    women_med_sec = sorted(venue_times_women)[len(venue_times_women) // 2]
+                if len(venue_times_women):
+                    women_med_sec = upper_median(venue_times_women)
                     women_median_str = format_time(women_med_sec)
                     if women_median_str.startswith("0"): women_median_str = women_median_str[1:]
 
@@ -352,31 +476,24 @@ def analysis():
                     'median_men': men_median_str,
                     'median_women': women_median_str,
                     'correction': correction,
-                    'correction_pct': correction_pct,
-                    'correction_display': format_correction(correction_pct),
-                    'correction_label': 'Baseline' if venue == BASELINE_VENUE else format_correction(correction_pct)
+                    'correction_pct': MEN_PCT[venue],
+                    'correction_display': correction_display,
+                    'correction_label': 'Baseline' if venue == BASELINE_VENUE else correction_display
                 })
         
-        # Calculate summary stats
-        fastest_venue = min(men_corrections.items(), key=lambda x: x[1])[0]
-        slowest_venue = max(men_corrections.items(), key=lambda x: x[1])[0]
-        slowest_correction = men_corrections[slowest_venue]
-        slowest_correction_pct = calculate_percentage_correction(slowest_correction, BASELINE_MEN_MEDIAN)
-        slowest_diff = format_correction(slowest_correction_pct)
-        
         return render_template('analysis.html',
                              venue_data=venue_data_all,
                              men_data=men_data,
                              women_data=women_data,
                              venue_stats=venue_stats,
-                             venue_rows=get_correction_table_data(),
-                             fastest_venue=fastest_venue,
-                             slowest_venue=slowest_venue,
-                             slowest_diff=slowest_diff,
-                             total_athletes=len(results),
+                             venue_rows=CORRECTION_TABLE,
+                             fastest_venue=FASTEST_VENUE,
+                             slowest_venue=SLOWEST_VENUE,
+                             slowest_diff=SLOWEST_DIFF,
+                             total_athletes=len(df),
                              num_venues=len(men_corrections),
                              admin_mode=admin_mode,
-                             show_feedback_popup=os.environ.get('HYROX_SHOW_FEEDBACK_POPUP', 'true').lower() == 'true')
+                             show_feedback_popup=show_feedback_popup)
     else:
         # No data available - use sample data
         venue_data = [
@@ -426,76 +543,71 @@ def analysis():
 @app.route('/statistics')
 def statistics():
     """Render detailed statistics table page."""
+    show_feedback_popup = os.environ.get('HYROX_SHOW_FEEDBACK_POPUP', 'true').lower() == 'true'
+    return cached_page('statistics', render_statistics, show_feedback_popup)
+
+
+def render_statistics(show_feedback_popup):
+    """Build the statistics page HTML from the full results table."""
     # Fetch all records to calculate venue stats
-    results = get_all_results()
+    df = load_results()
     
-    if results:
+    if not df.empty:
         # Group and filter by venue and gender (Top 80% only)
-        venues_dist = {}
         total_filtered_athletes = 0
         
-        for row in results:
-            v = row['venue']
-            g = row['gender']
-            t = row['finish_seconds']
-            
-            # Basic error filtering first
-            if t < 3000 or t > 9000:
-                continue
-                
-            if v not in venues_dist:
-                venues_dist[v] = {'M': [], 'W': []}
-            venues_dist[v][g].append(t)
+        # Basic error filtering first
+        in_range = df[df['finish_seconds'].between(3000, 9000)]
+        by_venue_gender = in_range.groupby(['venue', 'gender'], sort=False, observed=True)['finish_seconds']
+        
+        # Keep top 80% of each gender (fastest times are smaller numbers):
+        # rank within the group and cut at the 80th percentile index
+        rank = by_venue_gender.rank(method='first')
+        keep = (by_venue_gender.transform('size') * 0.8).astype(int)
+        top80 = in_range[rank <= keep]
+        
+        # Benchmark: the middle of each gender's top 80% (none when the cut is empty)
+        benchmark_rows = in_range[(rank == keep // 2 + 1) & (keep > 0)]
+        benchmarks = dict(zip(
+            zip(benchmark_rows['venue'], benchmark_rows['gender']),
+            benchmark_rows['finish_seconds'].tolist()
+        ))
+        
+        # One vectorized pass for every per-venue aggregate
+        by_venue = top80.groupby('venue', sort=False, observed=True)['finish_seconds']
+        venue_aggs = by_venue.agg(['size', 'min', 'max', 'mean'])
+        venue_aggs['std'] = by_venue.std(ddof=0)
+        venue_aggs = venue_aggs.to_dict('index')
 
         # Calculate detailed statistics for each venue
         stats_data = []
         
         # Use men's corrections for sorting
-        men_corrections = VENUE_CORRECTIONS['men']
-        
-        for venue, correction in sorted(men_corrections.items(), key=lambda x: x[1]):
-            if venue not in venues_dist:
-                continue
-                
-            men_times = sorted(venues_dist[venue]['M'])
-            women_times = sorted(venues_dist[venue]['W'])
-            
-            # Keep top 80% (fastest times are smaller numbers)
-            # Slice from 0 to 80th percentile index
-            men_cutoff_idx = int(len(men_times) * 0.8)
-            women_cutoff_idx = int(len(women_times) * 0.8)
-            
-            men_top80 = men_times[:men_cutoff_idx] if men_times else []
-            women_top80 = women_times[:women_cutoff_idx] if women_times else []
-            
-            all_top80 = men_top80 + women_top80
-            
+        for venue, correction in SORTED_MEN_CORRECTIONS:
             # Skip if no data after filtering
-            if not all_top80:
+            aggs = venue_aggs.get(venue)
+            if aggs is None:
                 continue
                 
-            total_filtered_athletes += len(all_top80)
-            
-            sorted_all = sorted(all_top80)
+            total_filtered_athletes += aggs['size']
             
-            # Standard Deviation
-            import numpy as np
-            std_dev = np.std(sorted_all)
-            
-            correction_pct = calculate_percentage_correction(correction, BASELINE_MEN_MEDIAN)
+            men_benchmark = benchmarks.get((venue, 'M'))
+            women_benchmark = benchmarks.get((venue, 'W'))
+            correction_display = MEN_DISP[venue]
             stats_data.append({
                 'name': venue,
-                'count': len(all_top80),
-                'fastest': format_time(min(sorted_all)),
-                'slowest': format_time(max(sorted_all)),
-                'average': format_time(sum(sorted_all) / len(sorted_all)),
-                'men_benchmark': format_time(men_top80[len(men_top80) // 2]) if men_top80 else 'N/A',
-                'women_benchmark': format_time(women_top80[len(women_top80) // 2]) if women_top80 else 'N/A',
-                'std_dev': format_time(std_dev),
+                'count': aggs['size'],
+                'fastest': format_time(aggs['min']),
+                'slowest': format_time(aggs['max']),
+                # format_time floors anyway; flooring here keeps its memo keys to whole seconds
+                'average': format_time(math.floor(aggs['mean'])),
+                'men_benchmark': format_time(men_benchmark) if men_benchmark is not None else 'N/A',
+                'women_benchmark': format_time(women_benchmark) if women_benchmark is not None else 'N/A',
+                'std_dev': format_time(math.floor(aggs['std'])),
                 'correction': correction,
-                'correction_pct': correction_pct,
-                'correction_display': format_correction(correction_pct),
-                'correction_label': 'Baseline' if venue == BASELINE_VENUE else format_correction(correction_pct)
+                'correction_pct': MEN_PCT[venue],
+                'correction_display': correction_display,
+                'correction_label': 'Baseline' if venue == BASELINE_VENUE else correction_display
             })
         
         return render_template('statistics.html',
@@ -503,7 +615,7 @@ def statistics():
                              venues=VENUES,
                              total_athletes=total_filtered_athletes,
                              num_venues=len(stats_data),
-                             show_feedback_popup=os.environ.get('HYROX_SHOW_FEEDBACK_POPUP', 'true').lower() == 'true')
+                             show_feedback_popup=show_feedback_popup)
     else:
         # No data available
         return render_template('statistics.html',
@@ -523,43 +635,27 @@ def distribution_data():
     if not genders:
         genders = ['M', 'W']  # Default to all
     
-    results = get_all_results()
+    df = load_results()
     
-    if not results:
+    if df.empty:
         return jsonify({'bins': [], 'counts': [], 'venues': VENUES})
     
-    # Filter data
-    times = []
-    for row in results:
-        t = row['finish_seconds']
-        g = row['gender']
-        v = row['venue']
-        
-        # Basic time filtering
-        if t < 3000 or t > 9000:
-            continue
-        
-        # Gender filter
-        if g not in genders:
-            continue
-        
-        # Venue filter (if specified)
-        if venues_filter and v not in venues_filter:
-            continue
-        
-        times.append(t)
+    # Filter data: basic time range, gender, and venue (if specified)
+    finish = df['finish_seconds']
+    mask = finish.between(3000, 9000) & df['gender'].isin(genders)
+    if venues_filter:
+        mask &= df['venue'].isin(venues_filter)
+    times = finish[mask].to_numpy()
     
     # Create histogram bins (5-minute intervals from 50min to 2h30)
     # 50 min = 3000s, 2h30 = 9000s
     bin_edges = list(range(3000, 9300, 300))  # 5-min bins
     bin_labels = []
-    bin_counts = []
     
-    for i in range(len(bin_edges) - 1):
-        start = bin_edges[i]
-        end = bin_edges[i + 1]
-        count = sum(1 for t in times if start <= t < end)
-        bin_counts.append(count)
+    # Bin index per time; exactly 9000s lands past the last [start, end) bin and is dropped
+    bin_counts = np.bincount((times - 3000) // 300, minlength=len(bin_edges))[:len(bin_edges) - 1].tolist()
+    
+    for start in bin_edges[:-1]:
         # Label format: "1:00" for 60 mins
         mins = start // 60
         label = f"{mins // 60}:{mins % 60:02d}"
@@ -568,7 +664,7 @@ def distribution_data():
     return jsonify({
         'bins': bin_labels,
         'counts': bin_counts,
-        'total': len(times),
+        'total': int(times.size),
         'venues': VENUES
     })
 
@@ -10,7 +10,8 @@ from .data_loader import (
     get_baseline_venue, 
     CORRECTIONS_FILE,
     get_race_results,
-    get_all_results
+    get_all_results,
+    get_results_frame
 )
 from .corrections import (
     calculate_percentage_correction,
@@ -19,7 +20,7 @@ from .corrections import (
     BASELINE_WOMEN_MEDIAN
 )
 from .time_utils import parse_time_to_seconds, format_time
-from .database import get_db_connection
+from .database import get_db_connection, get_db_version
 
 __all__ = [
     'load_venue_corrections',
@@ -33,5 +34,7 @@ __all__ = [
     'format_time',
     'get_race_results',
     'get_all_results',
-    'get_db_connection'
+    'get_results_frame',
+    'get_db_connection',
+    'get_db_version'
 ]
@@ -119,6 +119,33 @@ def get_all_results():
         conn.close()
 
 
+# Compact dtypes for the frame columns: venue/gender repeat heavily, and
+# finish_seconds fits comfortably in 32 bits
+RESULTS_DTYPES = {'venue': 'category', 'gender': 'category', 'finish_seconds': 'int32'}
+
+
+def get_results_frame(columns=('venue', 'gender', 'finish_seconds')):
+    """
+    Fetch race results as a DataFrame, selecting only the given columns.
+    
+    Rows come back in table order, matching get_all_results(). Columns listed
+    in RESULTS_DTYPES are loaded with those dtypes; group categorical columns
+    with observed=True.
+    """
+    # Imported here so workers that never serve the analysis pages skip pandas
+    import pandas as pd
+    
+    conn = get_db_connection()
+    try:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM race_results",
+            conn,
+            dtype={col: RESULTS_DTYPES[col] for col in columns if col in RESULTS_DTYPES}
+        )
+    finally:
+        conn.close()
+
+
 def get_venue_names():
     """Get a sorted list of unique venue names from the database."""
     conn = get_db_connection()
@@ -26,6 +26,16 @@ def get_db_connection():
     return conn
 
 
+def get_db_version():
+    """
+    Return a signature of the database files that changes whenever they are written.
+    
+    Covers the -wal file too, since WAL-mode writers only touch it until a checkpoint.
+    """
+    paths = (DB_PATH, DB_PATH.with_name(DB_PATH.name + '-wal'))
+    return tuple(p.stat().st_mtime_ns if p.exists() else None for p in paths)
+
+
 def init_db():
     """
     Initialize the database schema.
@@ -4,7 +4,19 @@ Time parsing and formatting utilities.
 Handles conversion between time strings (HH:MM:SS) and seconds.
 """
 
+import math
+import re
+from functools import lru_cache
 
+# HH:MM:SS or MM:SS, surrounding whitespace allowed
+_TIME_RE = re.compile(r'^\s*(?:(\d+):)?(\d+):(\d+)\s*$')
+
+# Zero-padded two-digit fields, indexed by value
+_PAD = tuple(f"{i:02d}" for i in range(100))
+
+
+# Finish times repeat heavily across requests, so both directions are memoized
+@lru_cache(maxsize=4096)
 def parse_time_to_seconds(time_str):
     """
     Parse time string (HH:MM:SS or MM:SS) to seconds.
@@ -15,23 +27,15 @@ def parse_time_to_seconds(time_str):
     Returns:
         int: Total seconds, or None if invalid format
     """
-    try:
-        if not time_str:
-            return None
-            
-        parts = time_str.strip().split(':')
-        if len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            return hours * 3600 + minutes * 60 + seconds
-        elif len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            return minutes * 60 + seconds
-        else:
-            return None
-    except ValueError:
+    m = _TIME_RE.match(time_str) if time_str else None
+    if not m:
         return None
+    
+    hours, minutes, seconds = m.groups()
+    return (int(hours) if hours else 0) * 3600 + int(minutes) * 60 + int(seconds)
 
 
+@lru_cache(maxsize=4096)
 def format_time(seconds):
     """
     Convert seconds to HH:MM:SS format.
@@ -45,8 +49,10 @@ def format_time(seconds):
     if seconds is None:
         return ""
         
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    # Floor once, then split with integer divmod
+    hours, rem = divmod(math.floor(seconds), 3600)
+    minutes, secs = divmod(rem, 60)
     # Use leading zero for hours to match test expectation "01:30:45"
+    if 0 <= hours < 100:
+        return f"{_PAD[hours]}:{_PAD[minutes]}:{_PAD[secs]}"
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"